@@ -26,12 +26,26 @@ including file paths, model parameters, and execution settings.
 
 '''
 
+import os
 import logging
 import yaml
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import List, Union, Literal, Dict, Optional, Any
 from pydantic import BaseModel, EmailStr, Field, computed_field, model_validator, field_validator
 
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
 class PrismPowerConfig(BaseModel):
     precalculation: Dict[str, int]
     precomputed: Dict[str, int]
@@ -113,80 +127,95 @@ class PrismConfig(BaseModel):
 
         return expanded_list
 
-    # Calculated Fields
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # Drop cached paths so they are rebuilt from the updated fields
+        if name in type(self).model_fields:
+            for computed_name in type(self).model_computed_fields:
+                self.__dict__.pop(computed_name, None)
+
+    # Calculated Fields (cached on first access; plain string joins, no Path objects)
 
     # Program dirs 
     @computed_field
-    @property
+    @cached_property
     def PROJECT_ROOT(self) -> str:
-        return str(Path(__file__).resolve().parent.parent)
+        return str(_PROJECT_ROOT)
     @computed_field
-    @property
+    @cached_property
     def INPUT_DIR(self) -> str:
-        return str(Path(self.PROJECT_ROOT) / self.INPUT_DIR_NAME)
+        return os.path.join(self.PROJECT_ROOT, self.INPUT_DIR_NAME)
     @computed_field
-    @property
+    @cached_property
     def MODELING_RESULTS_DIR(self) -> str:
-        return str(Path(self.PROJECT_ROOT) / self.MODELING_RESULTS_DIR_NAME)
+        return os.path.join(self.PROJECT_ROOT, self.MODELING_RESULTS_DIR_NAME)
     @computed_field
-    @property
+    @cached_property
     def PSIPRED_RESULTS_DIR(self) -> str:
-        return str(Path(self.PROJECT_ROOT) / self.PSIPRED_RESULTS_DIR_NAME)
+        return os.path.join(self.PROJECT_ROOT, self.PSIPRED_RESULTS_DIR_NAME)
     
     # Files dirs
     @computed_field
-    @property
+    @cached_property
     def CUSTOM_INIFILE_PATH(self) -> str:
-        return str(Path(self.INPUT_DIR) / self.CUSTOM_INIFILE_BASENAME)
+        return os.path.join(self.INPUT_DIR, self.CUSTOM_INIFILE_BASENAME)
     @computed_field
-    @property
+    @cached_property
     def CUSTOM_RSRFILE_PATH(self) -> str:
-        return str(Path(self.INPUT_DIR) / self.CUSTOM_RSRFILE_BASENAME)
+        return os.path.join(self.INPUT_DIR, self.CUSTOM_RSRFILE_BASENAME)
     @computed_field
-    @property
+    @cached_property
     def FASTA_FILE_PATH(self) -> str:
-        return str(Path(self.INPUT_DIR) / self.FASTA_FILE_BASENAME)
+        return os.path.join(self.INPUT_DIR, self.FASTA_FILE_BASENAME)
     @computed_field
-    @property
+    @cached_property
     def SS2_FILE_PATH(self) -> str:
-        return str(Path(self.INPUT_DIR) / self.SS2_FILE_BASENAME)
+        return os.path.join(self.INPUT_DIR, self.SS2_FILE_BASENAME)
     @computed_field
-    @property
+    @cached_property
     def MANUAL_ALIGNMENT_FILE(self) -> str:
-        return str(Path(self.INPUT_DIR) / self.MANUAL_ALIGNMENT_BASENAME)
+        return os.path.join(self.INPUT_DIR, self.MANUAL_ALIGNMENT_BASENAME)
     @computed_field
-    @property
+    @cached_property
     def MANUAL_ALIGNMENT_CDE_FILE(self) -> str:
-        return str(Path(self.INPUT_DIR) / self.MANUAL_ALIGNMENT_CDE_BASENAME)
+        return os.path.join(self.INPUT_DIR, self.MANUAL_ALIGNMENT_CDE_BASENAME)
     @computed_field
-    @property
+    @cached_property
     def PDB_TEMPLATE_FILES_PATHS(self) -> List[str]:
-        return [str(Path(self.INPUT_DIR) / pdb_file) for pdb_file in self.PDB_TEMPLATE_FILES_NAMES]
+        return [os.path.join(self.INPUT_DIR, pdb_file) for pdb_file in self.PDB_TEMPLATE_FILES_NAMES]
     @computed_field
-    @property
+    @cached_property
     def MAIN_PDB_TEMPLATE_PATH(self) -> str:
         return self.PDB_TEMPLATE_FILES_PATHS[0]
     @computed_field
-    @property
+    @cached_property
     def MAIN_ALIGN_CODE_TEMPLATE(self) -> str:
         return self.PDB_TEMPLATE_FILES_NAMES[0]
     @computed_field
-    @property
+    @cached_property
     def ALIGNMENT_FILE(self) -> str:
-        return str(Path(self.MODELING_RESULTS_DIR) / f'{self.MAIN_ALIGN_CODE_TEMPLATE}_{self.ALIGN_CODE_SEQUENCE}.ali')
+        return os.path.join(self.MODELING_RESULTS_DIR, f'{self.MAIN_ALIGN_CODE_TEMPLATE}_{self.ALIGN_CODE_SEQUENCE}.ali')
     @computed_field
-    @property
+    @cached_property
     def ALIGNMENT_CDE_FILE(self) -> str:
-        return str(Path(self.MODELING_RESULTS_DIR) / f'{self.MAIN_ALIGN_CODE_TEMPLATE}_{self.ALIGN_CODE_SEQUENCE}_cde.ali')
+        return os.path.join(self.MODELING_RESULTS_DIR, f'{self.MAIN_ALIGN_CODE_TEMPLATE}_{self.ALIGN_CODE_SEQUENCE}_cde.ali')
     @computed_field
-    @property
+    @cached_property
     def FINAL_RANKING_CSV(self) -> str:
-        return str(Path(self.MODELING_RESULTS_DIR) / 'final_ranking.csv')
+        return os.path.join(self.MODELING_RESULTS_DIR, 'final_ranking.csv')
 
 # ============================================================================
 # INSTANTIATION LOGIC
 # ============================================================================
 
+    def with_updates(self, updates: Dict[str, Any]) -> "PrismConfig":
+        '''
+        Returns a new validated config with the given fields replaced (one validation pass).
+        '''
+        data = self.model_dump(exclude=set(type(self).model_computed_fields))
+        data.update(updates)
+        return type(self).model_validate(data)
+
     def save_settings(self, yaml_path: str = "config.yaml"):
         '''
         Saves current settings back to a YAML file.
@@ -202,13 +231,13 @@ class PrismConfig(BaseModel):
 
         full_yaml_path = Path(self.PROJECT_ROOT) / yaml_path
         with open(full_yaml_path, "w") as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
 
 def load_settings(yaml_path: Optional[str] = None) -> PrismConfig:
     '''
     Loads the YAML file and returns a validated PrismConfig object.
     '''
-    project_root = Path(__file__).resolve().parent.parent
+    project_root = _PROJECT_ROOT
     
     if yaml_path is None:
         yaml_path = project_root / "config.yaml"
@@ -220,10 +249,45 @@ def load_settings(yaml_path: Optional[str] = None) -> PrismConfig:
     if not yaml_path.exists():
         raise FileNotFoundError(f"Config file not found at {yaml_path}")
         
-    with open(yaml_path, "r") as f:
-        raw_data = yaml.safe_load(f)
+    raw_data = _read_config_cache(yaml_path)
+    if raw_data is None:
+        with open(yaml_path, "r") as f:
+            raw_data = yaml.load(f, Loader=_YamlLoader)
+        _write_config_cache(yaml_path, raw_data)
     return PrismConfig(**raw_data)
 
+def _config_cache_path(yaml_path: Path) -> Path:
+    return yaml_path.with_name(f".{yaml_path.stem}.cache.json")
+
+def _read_config_cache(yaml_path: Path) -> Optional[Dict[str, Any]]:
+    '''
+    Returns the parsed YAML from the JSON sidecar if it was written for the current config file
+    (same mtime and size; either differing falls back to parsing the YAML).
+    '''
+    try:
+        with open(_config_cache_path(yaml_path), "rb") as f:
+            cached = _json.loads(f.read())
+        yaml_st = yaml_path.stat()
+        if cached.get("mtime_ns") == yaml_st.st_mtime_ns and cached.get("size") == yaml_st.st_size:
+            return cached["data"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return None
+
+def _write_config_cache(yaml_path: Path, raw_data: Dict[str, Any]) -> None:
+    '''
+    Stores the parsed YAML next to the config file, tagged with its mtime and size.
+    '''
+    try:
+        yaml_st = yaml_path.stat()
+        payload = _json.dumps({"mtime_ns": yaml_st.st_mtime_ns, "size": yaml_st.st_size, "data": raw_data})
+        if isinstance(payload, str):
+            payload = payload.encode()
+        with open(_config_cache_path(yaml_path), "wb") as f:
+            f.write(payload)
+    except (OSError, TypeError):
+        logging.debug(f"Could not write config cache for {yaml_path}")
+
 settings = None
 
 # ============================================================================
@@ -233,18 +297,14 @@ settings = None
 # sequence (def here to avoid circular imports from utils)
 sequence_full = None
 
+@lru_cache(maxsize=4)
 def read_fasta_sequence(file_path: str) -> str:
     '''
-    Read a FASTA file and return the sequence.
+    Read a FASTA file and return the sequence (memoized per path).
     '''
-    sequence = []
-    with open(file_path, 'r') as f:
-        for line in f:
-            if line.startswith('>'):
-                continue
-            else:
-                sequence.append(line.strip())
-    return ''.join(sequence)
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return b''.join(line.strip() for line in data.splitlines() if line[:1] != b'>').decode('ascii')
 
 def get_sequence():
     '''
@@ -253,8 +313,7 @@ def get_sequence():
     global sequence_full, settings
     if settings is None:
         settings = load_settings()
-    if sequence_full is None:
-        sequence_full = read_fasta_sequence(settings.FASTA_FILE_PATH)
+    sequence_full = read_fasta_sequence(settings.FASTA_FILE_PATH)
     return sequence_full
 
 # ============================================================================
@@ -265,10 +324,9 @@ def __getattr__(name):
     global settings, sequence_full
     if settings is None:
         settings = load_settings()
-        for field_name in PrismConfig.model_fields:
-            globals()[field_name] = getattr(settings, field_name)
-        for computed_name in PrismConfig.model_computed_fields:
-            globals()[computed_name] = getattr(settings, computed_name)
+        # dict(settings) keeps nested models (e.g. PRISM_POWER_SETTINGS) as objects
+        globals().update(dict(settings))
+        globals().update({name: getattr(settings, name) for name in PrismConfig.model_computed_fields})
     if name in globals():
         return globals()[name]
     raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -28,6 +28,9 @@ from . import config
 # Setup logging
 logger = logging.getLogger("PRISM.modeling_engine")
 
+# Splits Modeller atom IDs ('<Atom CA:12:A>') into their fields; field 2 is the residue number
+ATOM_ID_SPLIT_RE = re.compile(r'[: ]+')
+
 # ============================================================================
 #                           CUSTOM MODEL CLASSES
 # ============================================================================
@@ -72,17 +75,9 @@ class FixedRegionAutoModel(AutoModel):
         
     
         def get_residue_list(selection):
-            residues = []
-            seen = set()
-            for atom in selection:
-                atom_str = str(atom)
-                atom, atom_name, res_num, chain_id = re.split(r'[: ]+', atom_str)
-                if res_num not in seen:
-                    seen.add(res_num)
-                    residues.append({
-                        "res_num": res_num
-                    })
-            return residues
+            # dict.fromkeys dedupes residue numbers in first-seen order without a per-atom seen check
+            res_nums = dict.fromkeys(ATOM_ID_SPLIT_RE.split(str(atom))[2] for atom in selection)
+            return [{"res_num": res_num} for res_num in res_nums]
         fixed_prot_ids = get_residue_list(fixed_selection_protein)
         fixed_blk_ids = get_residue_list(fixed_selection_blk)
         optimizable_ids = get_residue_list(optimizable)
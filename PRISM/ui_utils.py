@@ -10,13 +10,19 @@ Handles Nextflow execution, PDB visualization, and file management.
 '''
 
 import os
+import stat
 import subprocess
-import pandas as pd
-import py3Dmol
 import sys
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Union, Optional, Generator
-from PRISM.config import settings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Any, Union, Optional, Generator, Tuple
+from PRISM import config
+
+# pandas and py3Dmol are imported lazily: most dashboard reruns never touch them
+if TYPE_CHECKING:
+    import pandas as pd
 
 def run_nextflow() -> subprocess.Popen:
     '''
@@ -37,6 +43,8 @@ def visualize_pdb(pdb_path: Union[str, Path], style: str = "cartoon", color: str
     '''
     Visualizes a PDB file using py3Dmol with configurable styles.
     '''
+    import py3Dmol
+
     with open(pdb_path, 'r') as f:
         pdb_data = f.read()
     
@@ -61,30 +69,28 @@ def list_files_in_dir(directory: Union[str, Path]) -> List[Dict[str, str]]:
     '''
     Lists files in a directory with metadata.
     '''
-    path = Path(directory)
-    if not path.exists():
+    if not os.path.isdir(directory):
         return []
     files = []
-    for f in path.iterdir():
-        if f.is_file():
-            files.append({
-                "name": f.name,
-                "size": f"{f.stat().st_size / 1024:.1f} KB",
-                "modified": pd.to_datetime(f.stat().st_mtime, unit='s').strftime('%Y-%m-%d %H:%M:%S')
-            })
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file():
+                st = entry.stat()
+                files.append({
+                    "name": entry.name,
+                    "size": f"{st.st_size / 1024:.1f} KB",
+                    "modified": time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(st.st_mtime))
+                })
     return files
 
-def run_tool(script_name: str, args: Optional[List[str]] = None) -> str:
+def _tool_command(script_name: str, args: Optional[List[str]] = None) -> Optional[List[str]]:
     '''
-    Executes a tool from the tools/ directory.
-    Output is redirected to the 'output_tools' folder.
+    Builds the command line for a tool, resolving path-like arguments to absolute paths.
+    Returns None if the tool does not exist.
     '''
-    output_dir = Path("output_tools")
-    output_dir.mkdir(exist_ok=True)
-
     tool_path = Path("tools").absolute() / script_name
     if not tool_path.exists():
-        return f"Error: Tool {script_name} not found."
+        return None
     
     processed_args = []
     if args:
@@ -96,6 +102,19 @@ def run_tool(script_name: str, args: Optional[List[str]] = None) -> str:
     
     cmd = [sys.executable, str(tool_path)]
     cmd.extend(processed_args)
+    return cmd
+
+def run_tool(script_name: str, args: Optional[List[str]] = None) -> str:
+    '''
+    Executes a tool from the tools/ directory.
+    Output is redirected to the 'output_tools' folder.
+    '''
+    output_dir = Path("output_tools")
+    output_dir.mkdir(exist_ok=True)
+
+    cmd = _tool_command(script_name, args)
+    if cmd is None:
+        return f"Error: Tool {script_name} not found."
     
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True, cwd=str(output_dir))
@@ -111,24 +130,58 @@ def run_tool(script_name: str, args: Optional[List[str]] = None) -> str:
     except Exception as e:
         return f"Unexpected error running tool: {e}"
 
-def get_score_distribution_data() -> Optional[pd.DataFrame]:
+def stream_tool(script_name: str, args: Optional[List[str]] = None) -> Generator[str, None, None]:
+    '''
+    Executes a tool like run_tool, yielding its combined stdout/stderr line by line as it runs.
+    '''
+    output_dir = Path("output_tools")
+    output_dir.mkdir(exist_ok=True)
+
+    cmd = _tool_command(script_name, args)
+    if cmd is None:
+        yield f"Error: Tool {script_name} not found.\n"
+        return
+    cmd.insert(1, "-u")  # unbuffered, so lines arrive while the tool runs
+
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, bufsize=1, cwd=str(output_dir))
+    except Exception as e:
+        yield f"Unexpected error running tool: {e}\n"
+        return
+
+    with process:
+        for line in process.stdout:
+            yield line
+    if process.returncode != 0:
+        yield f"\nError executing tool: {script_name}\nReturn code: {process.returncode}\n"
+
+@lru_cache(maxsize=4)
+def _parse_ranking_csv(csv_path: str, mtime_ns: int) -> "pd.DataFrame":
+    import pandas as pd
+    return pd.read_csv(csv_path)
+
+def _read_ranking_csv(csv_path: Union[str, Path]) -> Optional["pd.DataFrame"]:
+    '''
+    Reads a ranking CSV, reusing the parsed frame while the file's mtime is unchanged.
+    '''
+    try:
+        mtime_ns = os.stat(csv_path).st_mtime_ns
+    except OSError:
+        return None
+    return _parse_ranking_csv(str(csv_path), mtime_ns).copy()
+
+def get_score_distribution_data(csv_path: Optional[Union[str, Path]] = None) -> Optional["pd.DataFrame"]:
     '''
     Reads the final ranking CSV and returns data for plotting.
     '''
-    csv_path = settings.FINAL_RANKING_CSV
-    if os.path.exists(csv_path):
-        df = pd.read_csv(csv_path)
-        return df
-    return None
+    return _read_ranking_csv(csv_path or config.FINAL_RANKING_CSV)
 
-def load_ranking_csv() -> Optional[pd.DataFrame]:
+def load_ranking_csv(csv_path: Optional[Union[str, Path]] = None) -> Optional["pd.DataFrame"]:
     '''
     Loads the final ranking CSV if it exists.
     '''
-    csv_path = settings.FINAL_RANKING_CSV
-    if os.path.exists(csv_path):
-        return pd.read_csv(csv_path)
-    return None
+    return _read_ranking_csv(csv_path or config.FINAL_RANKING_CSV)
 
 def delete_path(path: Union[str, Path]) -> bool:
     '''
@@ -169,26 +222,111 @@ def move_path(src: Union[str, Path], dst: Union[str, Path]) -> bool:
     except Exception:
         return False
 
+# Linux FICLONE ioctl: share the source's data blocks copy-on-write (Btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+def _apply_stat(path: str, st: os.stat_result) -> None:
+    '''
+    Applies permission bits and timestamps from an already fetched stat result.
+    '''
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.chmod(path, stat.S_IMODE(st.st_mode))
+
+def _clone_file(src: Union[str, Path], dst: Union[str, Path], st: Optional[os.stat_result] = None) -> None:
+    '''
+    Copies a file with its mode and timestamps, using a reflink clone when the filesystem
+    supports it and a plain data copy otherwise. Pass the source's stat result when the
+    caller already has it to skip re-stating the file.
+    The data goes to a temporary file next to dst that replaces it only once complete, so a
+    failed copy never leaves dst emptied or half written.
+    '''
+    import shutil
+    import tempfile
+    if st is None:
+        st = os.stat(src)
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    dst_dir, dst_name = os.path.split(os.fspath(dst))
+    fd, tmp = tempfile.mkstemp(prefix=f".{dst_name}.", dir=dst_dir or ".")
+    os.close(fd)
+    try:
+        try:
+            import fcntl
+            with open(src, 'rb') as f_src, open(tmp, 'wb') as f_dst:
+                fcntl.ioctl(f_dst.fileno(), _FICLONE, f_src.fileno())
+        except (ImportError, OSError):
+            shutil.copyfile(src, tmp)
+        _apply_stat(tmp, st)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def _copy_workers(n_jobs: int) -> int:
+    return max(1, min(32, (os.cpu_count() or 1) * 4, n_jobs))
+
+def _copy_tree(src: Union[str, Path], dst: Union[str, Path], st: Optional[os.stat_result] = None) -> None:
+    '''
+    Recursively copies a directory, cloning its files concurrently on a thread pool.
+    The tree is walked with os.scandir so every entry is stat'ed exactly once.
+    The whole source tree is listed before any target directory is created, so copying a
+    folder into one of its own subfolders does not pick up the copy it is making.
+    Directory metadata is applied last, so read-only folders do not block their own contents.
+    '''
+    dirs, jobs = [], []
+    stack = [(os.fspath(src), os.fspath(dst), st or os.stat(src))]
+    while stack:
+        src_dir, dst_dir, dir_st = stack.pop()
+        dirs.append((dst_dir, dir_st))
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                target = os.path.join(dst_dir, entry.name)
+                if entry.is_dir():
+                    stack.append((entry.path, target, entry.stat()))
+                else:
+                    jobs.append((entry.path, target, entry.stat()))
+
+    os.makedirs(dirs[0][0])
+    for path, _ in dirs[1:]:
+        os.mkdir(path)
+    with ThreadPoolExecutor(max_workers=_copy_workers(len(jobs))) as ex:
+        for future in [ex.submit(_clone_file, *job) for job in jobs]:
+            future.result()
+    for path, dir_st in reversed(dirs):
+        _apply_stat(path, dir_st)
+
 def copy_path(src: Union[str, Path], dst: Union[str, Path]) -> bool:
     '''
     Copies a file or directory to a new location.
     '''
-    import shutil
     try:
-        src_path = Path(src)
-        if src_path.is_dir():
-            shutil.copytree(src, dst)
+        st = os.stat(src)
+        if stat.S_ISDIR(st.st_mode):
+            _copy_tree(src, dst, st)
         else:
-            shutil.copy2(src, dst)
+            _clone_file(src, dst, st)
         return True
     except Exception:
         return False
 
+def copy_paths(pairs: List[Tuple[Union[str, Path], Union[str, Path]]]) -> int:
+    '''
+    Copies several (src, dst) pairs concurrently. Returns the number of successful copies.
+    '''
+    if not pairs:
+        return 0
+    with ThreadPoolExecutor(max_workers=_copy_workers(len(pairs))) as ex:
+        return sum(ex.map(lambda pair: copy_path(*pair), pairs))
+
 def list_root_dirs() -> List[str]:
     '''
     Lists directories in the project root, excluding hidden ones.
     '''
-    dirs = [d for d in os.listdir(".") if os.path.isdir(d) and not d.startswith(".")]
+    with os.scandir(".") as it:
+        dirs = [e.name for e in it if not e.name.startswith(".") and e.is_dir()]
     return sorted(dirs)
 
 def get_all_project_files() -> List[str]:
@@ -202,10 +340,9 @@ def get_all_project_files() -> List[str]:
         # Filter out excluded directories in-place to prevent walking into them
         dirs[:] = [d for d in dirs if d not in exclude_dirs and not d.startswith(".")]
         
-        for f in files:
-            if f.startswith("."): continue
-            p = os.path.relpath(os.path.join(root, f), ".")
-            all_files.append(p)
+        # os.walk(".") yields "." then "./sub/dir": build one relative prefix per directory
+        prefix = "" if root == "." else root[2:] + os.sep
+        all_files.extend(f"{prefix}{f}" for f in files if not f.startswith("."))
     return sorted(all_files)
 
 def save_uploaded_file(uploaded_file: Any, target_dir: Union[str, Path]) -> str:
@@ -191,18 +191,10 @@ def run_prerequisites(env: Environ) -> Tuple[str, List[Tuple[int, int]], Set[int
 # ============================================================================
 
 
-def flatten_ali_file(filepath: Union[str, Path]) -> None:
+def _flatten_ali_lines(lines: List[str]) -> List[str]:
     '''
-    Flatten an alignment file by removing all lines between sequences.
-
-    Args:
-        filepath: Path to the alignment file to flatten
+    Joins each sequence's wrapped lines into one line, terminated by '*'.
     '''
-    path = Path(filepath)
-    if not path.exists():
-        raise FileNotFoundError(f"File not found: {filepath}")
-
-    lines = path.read_text().splitlines()
     new_lines, seq_buffer = [], []
 
     for line in lines:
@@ -224,6 +216,22 @@ def flatten_ali_file(filepath: Union[str, Path]) -> None:
             full_seq += '*'
         new_lines.append(full_seq)
 
+    return new_lines
+
+
+def flatten_ali_file(filepath: Union[str, Path]) -> None:
+    '''
+    Flatten an alignment file by removing all lines between sequences.
+
+    Args:
+        filepath: Path to the alignment file to flatten
+    '''
+    path = Path(filepath)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {filepath}")
+
+    new_lines = _flatten_ali_lines(path.read_text().splitlines())
+
     path.write_text('\n'.join(new_lines) + '\n') 
     logger.info(f"[ENVIRONMENT] Ali file flattened: {filepath}")
 
@@ -280,12 +288,30 @@ def read_sequences_from_ali(ali_file: Union[str, Path]) -> Dict[str, str]:
     lines = Path(ali_file).read_text().splitlines()
     for line in lines:
         line = line.strip()
-        if line.startswith('>P1;'):
-            if current_code:
-                sequences[current_code] = ''.join(current_seq_parts)
-            current_code = line.split(';')[1].strip()
-            current_seq_parts = []
-        elif current_code and not line.startswith(('structure', 'sequence', 'CDE', '#')):
+        if not line:
+            continue
+        # Dispatch on the first character; raw sequence lines take the fast path
+        c = line[0]
+        if c == '>':
+            if line.startswith('>P1;'):
+                if current_code:
+                    sequences[current_code] = ''.join(current_seq_parts)
+                current_code = line.split(';')[1].strip()
+                current_seq_parts = []
+            elif current_code:
+                current_seq_parts.append(line)
+            continue
+        if not current_code:
+            continue
+        if c not in 'sCD#':
+            current_seq_parts.append(line)
+        elif c == 's' and (line.startswith('structure') or line.startswith('sequence')):
+            continue
+        elif c == 'C' and line.startswith('CDE'):
+            continue
+        elif c == '#':
+            continue
+        else:
             current_seq_parts.append(line)
 
     if current_code:
@@ -339,24 +365,34 @@ def add_cde_line_to_pir(clean_ali_path: Union[str, Path], cde_ali_path: Union[st
     cde_line = "# CDE:" + "".join(cde_chars)
 
     input_lines = Path(clean_ali_path).read_text().splitlines()
-    output_lines = []
+    target_header = f'>P1;{align_code}'
+    insert_at = []
     sequences_counter = 0
-    add_cde_sequences_counter = 0
     found_target = False
 
-    for line in input_lines:
-        output_lines.append(line)
-        if line.strip().startswith('>P1;'):
+    for i, line in enumerate(input_lines):
+        stripped = line.strip()
+        if stripped.startswith('>P1;'):
             sequences_counter += 1
-        if line.strip().startswith(f'>P1;{align_code}'):
+        if stripped.startswith(target_header):
             found_target = True
-        elif found_target and line.strip().startswith('sequence:'):
-            output_lines.append(cde_line)
-            add_cde_sequences_counter += 1
+        elif found_target and stripped.startswith('sequence:'):
+            insert_at.append(i + 1)
             found_target = False
-    
-    Path(cde_ali_path).write_text('\n'.join(output_lines) + '\n')
-    flatten_ali_file(cde_ali_path)
+    add_cde_sequences_counter = len(insert_at)
+
+    # Splice the CDE line between unchanged slices instead of re-appending every input line
+    output_lines = []
+    prev = 0
+    for idx in insert_at:
+        output_lines.extend(input_lines[prev:idx])
+        output_lines.append(cde_line)
+        prev = idx
+    output_lines.extend(input_lines[prev:])
+    
+    # Flatten in memory so the CDE file is written once instead of written, re-read and rewritten
+    Path(cde_ali_path).write_text('\n'.join(_flatten_ali_lines(output_lines)) + '\n')
+    logger.info(f"[ENVIRONMENT] Ali file flattened: {cde_ali_path}")
     logger.info(f"[ENVIRONMENT] CDE line added to PIR file: {cde_ali_path}")
     logger.info(f"[ENVIRONMENT] {ss_blk} '.' added to CDE line (BLK residues in aligned target sequence)")
     logger.info(f"[ENVIRONMENT] {sequences_counter} sequences in PIR file: {clean_ali_path}")
@@ -415,7 +451,7 @@ def prepare_prism_power_files(phase: str) -> Tuple[List[str], str]:
         code = lines[0].strip()
         ali_map[code] = lines[1:] 
 
-    new_ali_content = header
+    ali_parts = [header]
     
     for base_pdb, count in power_map.items():
         base_code = None
@@ -428,28 +464,26 @@ def prepare_prism_power_files(phase: str) -> Tuple[List[str], str]:
             logger.error(f"[ERROR] Template {base_pdb} not found in alignment IDs: {list(ali_map.keys())}")
             continue
 
-        original_lines = ali_map[base_code]
+        # Every replica shares the same block body: build it once, fan it out per replica ID
+        block_lines = list(ali_map[base_code])
+        if block_lines and block_lines[0].startswith('structure'):
+            fields = block_lines[0].split(':')
+            fields[1] = base_pdb 
+            block_lines[0] = ':'.join(fields)
+        block_body = '\n'.join(block_lines) + "\n"
         
-        for i in range(count):
-            replica_id = f"{base_code}_{i:03d}" if i > 0 else base_code
-            all_expanded_knowns.append(replica_id)
-            
-            block_lines = list(original_lines)
-            if block_lines and block_lines[0].startswith('structure'):
-                fields = block_lines[0].split(':')
-                fields[1] = base_pdb 
-                block_lines[0] = ':'.join(fields)
-            
-            new_ali_content += f">P1;{replica_id}\n" + '\n'.join(block_lines) + "\n"
+        replica_ids = [f"{base_code}_{i:03d}" if i else base_code for i in range(count)]
+        all_expanded_knowns.extend(replica_ids)
+        ali_parts.extend(f">P1;{replica_id}\n{block_body}" for replica_id in replica_ids)
 
     target_code = config.ALIGN_CODE_SEQUENCE
     if target_code in ali_map:
-        new_ali_content += f">P1;{target_code}\n" + '\n'.join(ali_map[target_code]) + "\n"
+        ali_parts.append(f">P1;{target_code}\n" + '\n'.join(ali_map[target_code]) + "\n")
     else:
         logger.error(f"[ERROR] Target code '{target_code}' not found in original alignment.")
 
     with open(power_ali_path, 'w') as f:
-        f.write(new_ali_content)
+        f.write(''.join(ali_parts))
     
     logger.info(f"[ENVIRONMENT] Virtual power alignment generated: {power_ali_path}")
     logger.info(f"{len(all_expanded_knowns)} virtual templates defined (Target excluded).")
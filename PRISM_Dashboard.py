@@ -14,14 +14,15 @@ import os
 import yaml
 import json
 import sys
-import pandas as pd
-import plotly.express as px
+import time
+from collections import deque
+from typing import List, Optional
 from PRISM.config import settings, PrismConfig, load_settings
 from PRISM.ui_utils import (
     run_nextflow, get_nextflow_progress, visualize_pdb, 
     save_uploaded_file, load_ranking_csv, list_files_in_dir,
-    run_tool, get_score_distribution_data, delete_path,
-    create_directory, list_root_dirs, move_path, copy_path,
+    stream_tool, get_score_distribution_data, delete_path,
+    create_directory, list_root_dirs, move_path, copy_paths,
     get_all_project_files
 )
 import streamlit.components.v1 as components
@@ -39,40 +40,19 @@ GUI_TAB_ORDER = [
     {"id": "results", "label": "📊 Results"},
 ]
 
-st.set_page_config(page_title="PRISM Dashboard", layout="wide")
-
-# Dynamic Logo placement
-logo_path = os.path.join("PRISM", "logo.png")
-if os.path.exists(logo_path):
-    st.logo(logo_path, icon_image=None) # Sidebar
-    col_logo, col_title = st.columns([1, 10])
-    with col_logo:
-        st.image(logo_path, width=60) # Header logo
-    with col_title:
-        st.title("PRISM: Protected-Region Insertion Suite for Modeling")
-else:
-    st.title("🛡️ PRISM: Protected-Region Insertion Suite for Modeling")
-st.markdown("---")
-
-if 'config' not in st.session_state:
-    try:
-        st.session_state.config = load_settings()
-    except Exception as e:
-        st.error(f"Could not load config.yaml. Please ensure it exists. Error: {e}")
-        st.stop()
+# --- EXECUTION LOG STREAMING ---
+LOG_TAIL_LINES = 2000
+LOG_FLUSH_INTERVAL = 0.25  # seconds
 
-# Sidebar
-# Theme
-theme = st.sidebar.select_slider("Select GUI Theme", options=["Default", "Professional", "High Contrast", "Dark Modern"])
-
-if theme == "Professional":
-    st.markdown("""
+# --- GUI THEMES ---
+# Built once at import; the sidebar only looks the selected theme up.
+THEME_CSS = {
+    "Professional": """
         <style>
         .stApp { background-color: #f0f2f6 !important; }
         </style>
-        """, unsafe_allow_html=True)
-elif theme == "High Contrast":
-    st.markdown("""
+        """,
+    "High Contrast": """
         <style>
         .stApp { background-color: #000000 !important; color: #FFFF00 !important;}
         .stMarkdown p, .stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4, 
@@ -92,9 +72,8 @@ elif theme == "High Contrast":
             border-right: 2px solid #FFFF00 !important;}
         section[data-testid="stSidebar"] * {color: #FFFF00 !important;}
         </style>
-        """, unsafe_allow_html=True)
-elif theme == "Dark Modern":
-    st.markdown("""
+        """,
+    "Dark Modern": """
         <style>
         .stApp { background-color: #0e1117 !important; color: white !important; }
         .stApp p, .stApp h1, .stApp h2, .stApp h3, .stApp h4, .stApp label, .stApp span { color: white !important; }
@@ -104,7 +83,94 @@ elif theme == "Dark Modern":
         section[data-testid="stSidebar"] { background-color: #1a1c24 !important; }
         section[data-testid="stSidebar"] * { color: white !important; }
         </style>
-        """, unsafe_allow_html=True)
+        """,
+}
+
+st.set_page_config(page_title="PRISM Dashboard", layout="wide")
+
+# --- CACHED LOADERS ---
+# load_settings() reads the config.yaml that sits next to this script
+CONFIG_YAML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml")
+
+# Streamlit reruns the whole script on every interaction; the mtime arguments
+# make these caches invalidate as soon as the underlying files change.
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+def _stat_stamp(path: str) -> tuple:
+    try:
+        st_ = os.stat(path)
+        return (st_.st_mtime_ns, st_.st_size)
+    except OSError:
+        return (0, 0)
+
+@st.cache_resource
+def _load_config(stamp: tuple) -> PrismConfig:
+    # stamp: config.yaml's (mtime_ns, size), so edits or restores on disk reload it
+    return load_settings()
+
+@st.cache_data(ttl=5)
+def _cached_list_files(directory: str, mtime: float):
+    return list_files_in_dir(directory)
+
+@st.cache_data(ttl=5)
+def _cached_scan(directory: str, suffix: str, mtime: float) -> Optional[List[str]]:
+    # One scandir pass; None signals a missing directory
+    try:
+        with os.scandir(directory) as it:
+            return [e.name for e in it if e.name.endswith(suffix) and e.is_file()]
+    except FileNotFoundError:
+        return None
+
+@st.cache_data(max_entries=32)
+def _cached_visualize(pdb_path: str, mtime: float, style: str, color: str) -> str:
+    return visualize_pdb(pdb_path, style=style, color=color)
+
+@st.cache_resource
+def _plotly_go():
+    # Deferred until the Results tab has data to plot
+    import plotly.graph_objects as go
+    return go
+
+@st.cache_data(ttl=5)
+def _cached_score_data(csv_path: str, mtime: float):
+    df = get_score_distribution_data(csv_path)
+    if df is not None:
+        # Coerce once so the table and both plots share the same float32 buffers
+        df = df.astype({"DOPEHR_score": "float32", "DOPEHR_zscore": "float32"})
+    return df
+
+# Dynamic Logo placement
+logo_path = os.path.join("PRISM", "logo.png")
+if os.path.exists(logo_path):
+    st.logo(logo_path, icon_image=None) # Sidebar
+    col_logo, col_title = st.columns([1, 10])
+    with col_logo:
+        st.image(logo_path, width=60) # Header logo
+    with col_title:
+        st.title("PRISM: Protected-Region Insertion Suite for Modeling")
+else:
+    st.title("🛡️ PRISM: Protected-Region Insertion Suite for Modeling")
+st.markdown("---")
+
+if 'config' not in st.session_state:
+    try:
+        # Per-session copy so Save edits do not leak into the shared cached instance
+        st.session_state.config = _load_config(_stat_stamp(CONFIG_YAML_PATH)).model_copy(deep=True)
+    except Exception as e:
+        st.error(f"Could not load config.yaml. Please ensure it exists. Error: {e}")
+        st.stop()
+
+# Sidebar
+# Theme
+theme = st.sidebar.select_slider("Select GUI Theme", options=["Default", "Professional", "High Contrast", "Dark Modern"])
+
+css = THEME_CSS.get(theme)
+if css:
+    st.markdown(css, unsafe_allow_html=True)
 
 st.sidebar.markdown("---")
 st.sidebar.caption("PRISM v1.2.0 | Production Refactor")
@@ -125,152 +191,169 @@ tab_file_mgmt = tab_map["file_mgmt"]
 with tab_config:
     st.header("Global Pipeline Configuration")
     
-    # Group 1: Core Modeling Parameters
-    with st.container(border=True):
-        st.subheader("🧬 Modeling & Refinement")
-        col1, col2 = st.columns(2)
-        with col1:
-            total_models = st.number_input("TOTAL_HOMOLOGY_MODELS", value=st.session_state.config.TOTAL_HOMOLOGY_MODELS, min_value=1)
-            top_refine = st.number_input("TOP_MODELS_FOR_REFINEMENT", value=st.session_state.config.TOP_MODELS_FOR_REFINEMENT, min_value=0)
-            loop_models = st.number_input("LOOP_MODELS_PER_TARGET", value=st.session_state.config.LOOP_MODELS_PER_TARGET, min_value=1)
-            flank_size = st.number_input("MOBILE_FLANK_RESIDUES", value=st.session_state.config.MOBILE_FLANK_RESIDUES, min_value=0)
-        with col2:
-            repulsion = st.number_input("BLOCK_REPULSION_RADIUS (Å)", value=st.session_state.config.BLOCK_REPULSION_RADIUS, step=0.1)
-            refine_flanks = st.checkbox("REFINE_FLANKS_DURING_AUTOMODEL", value=st.session_state.config.REFINE_FLANKS_DURING_AUTOMODEL)
-            best_final = st.text_input("NUM_BEST_FINAL_MODELS (e.g., 5 or 'inf')", value=str(st.session_state.config.NUM_BEST_FINAL_MODELS))
-
-        st.markdown("---")
+    # Widgets are batched in a form: edits only rerun the script on Save
+    with st.form("config_form", border=False):
+        # Group 1: Core Modeling Parameters
+        with st.container(border=True):
+            st.subheader("🧬 Modeling & Refinement")
+            col1, col2 = st.columns(2)
+            with col1:
+                total_models = st.number_input("TOTAL_HOMOLOGY_MODELS", value=st.session_state.config.TOTAL_HOMOLOGY_MODELS, min_value=1)
+                top_refine = st.number_input("TOP_MODELS_FOR_REFINEMENT", value=st.session_state.config.TOP_MODELS_FOR_REFINEMENT, min_value=0)
+                loop_models = st.number_input("LOOP_MODELS_PER_TARGET", value=st.session_state.config.LOOP_MODELS_PER_TARGET, min_value=1)
+                flank_size = st.number_input("MOBILE_FLANK_RESIDUES", value=st.session_state.config.MOBILE_FLANK_RESIDUES, min_value=0)
+            with col2:
+                repulsion = st.number_input("BLOCK_REPULSION_RADIUS (Å)", value=st.session_state.config.BLOCK_REPULSION_RADIUS, step=0.1)
+                refine_flanks = st.checkbox("REFINE_FLANKS_DURING_AUTOMODEL", value=st.session_state.config.REFINE_FLANKS_DURING_AUTOMODEL)
+                best_final = st.text_input("NUM_BEST_FINAL_MODELS (e.g., 5 or 'inf')", value=str(st.session_state.config.NUM_BEST_FINAL_MODELS))
+
+            st.markdown("---")
         
-    # Group 2: External Dependencies & API
-    with st.container(border=True):
-        st.subheader("🌐 External Tools & Predictions")
-        col3, col4 = st.columns(2)
-        with col3:
-            psipred_pred = st.toggle("PERFORM_PSIPRED_PREDICTION", value=st.session_state.config.PERFORM_PSIPRED_PREDICTION)
-        with col4:
-            psipred_email = st.text_input("PSIPRED_EMAIL", value=st.session_state.config.PSIPRED_EMAIL)
-            psipred_poll = st.number_input("PSIPRED_POLL_INTERVAL (sec)", value=st.session_state.config.PSIPRED_POLL_INTERVAL, min_value=10)
-
-    # Group 3: Manual Overrides & Data Control
-    with st.container(border=True):
-        st.subheader("🛠️ Manual Overrides & Control")
-        col_ov1, col_ov2 = st.columns(2)
-        with col_ov1:
-            use_manual_ali = st.toggle("USE_MANUAL_ALIGNMENT", value=st.session_state.config.USE_MANUAL_ALIGNMENT)
-        with col_ov2:
-            manual_opt = st.toggle("USE_MANUAL_OPTIMIZATION_SELECTION", value=st.session_state.config.USE_MANUAL_OPTIMIZATION_SELECTION)
+        # Group 2: External Dependencies & API
+        with st.container(border=True):
+            st.subheader("🌐 External Tools & Predictions")
+            col3, col4 = st.columns(2)
+            with col3:
+                psipred_pred = st.toggle("PERFORM_PSIPRED_PREDICTION", value=st.session_state.config.PERFORM_PSIPRED_PREDICTION)
+            with col4:
+                psipred_email = st.text_input("PSIPRED_EMAIL", value=st.session_state.config.PSIPRED_EMAIL)
+                psipred_poll = st.number_input("PSIPRED_POLL_INTERVAL (sec)", value=st.session_state.config.PSIPRED_POLL_INTERVAL, min_value=10)
+
+        # Group 3: Manual Overrides & Data Control
+        with st.container(border=True):
+            st.subheader("🛠️ Manual Overrides & Control")
+            col_ov1, col_ov2 = st.columns(2)
+            with col_ov1:
+                use_manual_ali = st.toggle("USE_MANUAL_ALIGNMENT", value=st.session_state.config.USE_MANUAL_ALIGNMENT)
+            with col_ov2:
+                manual_opt = st.toggle("USE_MANUAL_OPTIMIZATION_SELECTION", value=st.session_state.config.USE_MANUAL_OPTIMIZATION_SELECTION)
             
-        if manual_opt:
             opt_res_str = st.text_area("MANUAL_OPTIMIZATION_RESIDUES (Space separated)", 
                                      value=" ".join(map(str, st.session_state.config.MANUAL_OPTIMIZATION_RESIDUES)),
-                                     help="Add residue numbers. This box appears instantly when the toggle is ON.")
-        else:
-            opt_res_str = ""
+                                     help="Add residue numbers. Only applied when USE_MANUAL_OPTIMIZATION_SELECTION is ON.")
 
-        col_fix1, col_fix2 = st.columns([1, 1])
-        with col_fix1:
-            manual_fix = st.toggle("USE_MANUAL_FIXATION_SELECTION", value=st.session_state.config.USE_MANUAL_FIXATION_SELECTION)
+            col_fix1, col_fix2 = st.columns([1, 1])
+            with col_fix1:
+                manual_fix = st.toggle("USE_MANUAL_FIXATION_SELECTION", value=st.session_state.config.USE_MANUAL_FIXATION_SELECTION)
         
-        if manual_fix:
             fix_res_str = st.text_area("MANUAL_FIXATION_RESIDUES (Space separated)", 
                                      value=" ".join(map(str, st.session_state.config.MANUAL_FIXATION_RESIDUES)),
-                                     help="Add residue numbers to FORCE FIXation. These will be treated as experimental residues.")
-        else:
-            fix_res_str = ""
-
-    # Group 4: Execution Engine
-    with st.container(border=True):
-        st.subheader("💻 Execution Engine")
-        col5, col6 = st.columns(2)
-        with col5:
-            paradigm = st.selectbox("EXECUTION_PARADIGM", ["prism-power", "precalculation", "precomputed", "normal"], 
-                                    index=["prism-power", "precalculation", "precomputed", "normal"].index(st.session_state.config.EXECUTION_PARADIGM))
-            modeller_cores = st.number_input("MODELLER_CORES", value=st.session_state.config.MODELLER_CORES, min_value=1)
-        with col6:
-            parallel_jobs = st.number_input("TOTAL_PARALLEL_JOBS", value=st.session_state.config.TOTAL_PARALLEL_JOBS, min_value=1)
-
-    # Group 5: Templates & Power Settings
-    with st.container(border=True):
-        st.subheader("🧬 Templates & PRISM Power")
-        pdb_names_str = st.text_area("PDB_TEMPLATE_FILES_NAMES (One per line, first is MAIN)", 
-                                     value="\n".join(st.session_state.config.PDB_TEMPLATE_FILES_NAMES))
+                                     help="Add residue numbers to FORCE FIXation. These will be treated as experimental residues. "
+                                          "Only applied when USE_MANUAL_FIXATION_SELECTION is ON.")
+
+        # Group 4: Execution Engine
+        with st.container(border=True):
+            st.subheader("💻 Execution Engine")
+            col5, col6 = st.columns(2)
+            with col5:
+                paradigm = st.selectbox("EXECUTION_PARADIGM", ["prism-power", "precalculation", "precomputed", "normal"], 
+                                        index=["prism-power", "precalculation", "precomputed", "normal"].index(st.session_state.config.EXECUTION_PARADIGM))
+                modeller_cores = st.number_input("MODELLER_CORES", value=st.session_state.config.MODELLER_CORES, min_value=1)
+            with col6:
+                parallel_jobs = st.number_input("TOTAL_PARALLEL_JOBS", value=st.session_state.config.TOTAL_PARALLEL_JOBS, min_value=1)
+
+        # Group 5: Templates & Power Settings
+        with st.container(border=True):
+            st.subheader("🧬 Templates & PRISM Power")
+            pdb_names_str = st.text_area("PDB_TEMPLATE_FILES_NAMES (One per line, first is MAIN)", 
+                                         value="\n".join(st.session_state.config.PDB_TEMPLATE_FILES_NAMES))
         
-        if paradigm == "prism-power":
-            with st.expander("⚡ PRISM Power Settings (JSON format)"):
+            with st.expander("⚡ PRISM Power Settings (JSON format, used by prism-power)"):
                 power_settings = st.session_state.config.PRISM_POWER_SETTINGS
                 if power_settings:
                     power_data = power_settings.model_dump() if hasattr(power_settings, 'model_dump') else power_settings
                 else:
                     power_data = {}
                 power_json = st.text_area("Config JSON", value=json.dumps(power_data, indent=2), height=200)
-        else:
-            power_json = "{}"
-
-    with st.expander("📝 Naming & Path Constraints (Advanced)"):
-        st.warning("Changing these may require re-organizing your input directory.")
-        col_adv1, col_adv2 = st.columns(2)
-        with col_adv1:
-            seq_code = st.text_input("ALIGN_CODE_SEQUENCE", value=st.session_state.config.ALIGN_CODE_SEQUENCE)
-            chain_id = st.text_input("CHAIN_ID", value=st.session_state.config.CHAIN_ID)
-            blk_chain = st.text_input("BLK_CHAIN_ID", value=st.session_state.config.BLK_CHAIN_ID)
-            fasta_base = st.text_input("FASTA_FILE_BASENAME", value=st.session_state.config.FASTA_FILE_BASENAME)
-            ss2_base = st.text_input("SS2_FILE_BASENAME", value=st.session_state.config.SS2_FILE_BASENAME)
-            manual_ali_base = st.text_input("MANUAL_ALIGNMENT_BASENAME", value=st.session_state.config.MANUAL_ALIGNMENT_BASENAME)
-        with col_adv2:
-            ini_base = st.text_input("CUSTOM_INIFILE_BASENAME", value=st.session_state.config.CUSTOM_INIFILE_BASENAME)
-            rsr_base = st.text_input("CUSTOM_RSRFILE_BASENAME", value=st.session_state.config.CUSTOM_RSRFILE_BASENAME)
-            input_dir_name = st.text_input("INPUT_DIR_NAME", value=st.session_state.config.INPUT_DIR_NAME)
-            modeling_dir_name = st.text_input("MODELING_RESULTS_DIR_NAME", value=st.session_state.config.MODELING_RESULTS_DIR_NAME)
-            psipred_dir_name = st.text_input("PSIPRED_RESULTS_DIR_NAME", value=st.session_state.config.PSIPRED_RESULTS_DIR_NAME)
-
-    st.markdown("---")
-    if st.button("💾 Save All Configuration", width='stretch'):
-            try:
-                st.session_state.config.TOTAL_HOMOLOGY_MODELS = total_models
-                st.session_state.config.TOP_MODELS_FOR_REFINEMENT = top_refine
-                st.session_state.config.LOOP_MODELS_PER_TARGET = loop_models
-                st.session_state.config.MOBILE_FLANK_RESIDUES = flank_size
-                st.session_state.config.BLOCK_REPULSION_RADIUS = repulsion
-                st.session_state.config.REFINE_FLANKS_DURING_AUTOMODEL = refine_flanks
-                st.session_state.config.NUM_BEST_FINAL_MODELS = int(best_final) if best_final.isdigit() else best_final
-                
-                st.session_state.config.PERFORM_PSIPRED_PREDICTION = psipred_pred
-                st.session_state.config.PSIPRED_EMAIL = psipred_email
-                st.session_state.config.PSIPRED_POLL_INTERVAL = psipred_poll
-                st.session_state.config.USE_MANUAL_ALIGNMENT = use_manual_ali
-                
-                st.session_state.config.EXECUTION_PARADIGM = paradigm
-                st.session_state.config.MODELLER_CORES = modeller_cores
-                st.session_state.config.TOTAL_PARALLEL_JOBS = parallel_jobs
-                st.session_state.config.USE_MANUAL_OPTIMIZATION_SELECTION = manual_opt
-                st.session_state.config.USE_MANUAL_FIXATION_SELECTION = manual_fix
-                
-                st.session_state.config.MANUAL_OPTIMIZATION_RESIDUES = [int(r) for r in opt_res_str.split()] if opt_res_str else []
-                st.session_state.config.MANUAL_FIXATION_RESIDUES = [int(r) for r in fix_res_str.split()] if fix_res_str else []
-                st.session_state.config.PDB_TEMPLATE_FILES_NAMES = [n.strip() for n in pdb_names_str.split("\n") if n.strip()]
-                
-                if paradigm == "prism-power":
-                    power_data = json.loads(power_json)
-                    st.session_state.config.PRISM_POWER_SETTINGS = power_data
-                
-                st.session_state.config.ALIGN_CODE_SEQUENCE = seq_code
-                st.session_state.config.CHAIN_ID = chain_id
-                st.session_state.config.BLK_CHAIN_ID = blk_chain
-                st.session_state.config.FASTA_FILE_BASENAME = fasta_base
-                st.session_state.config.SS2_FILE_BASENAME = ss2_base
-                st.session_state.config.MANUAL_ALIGNMENT_BASENAME = manual_ali_base
-                
-                st.session_state.config.CUSTOM_INIFILE_BASENAME = ini_base
-                st.session_state.config.CUSTOM_RSRFILE_BASENAME = rsr_base
-                st.session_state.config.INPUT_DIR_NAME = input_dir_name
-                st.session_state.config.MODELING_RESULTS_DIR_NAME = modeling_dir_name
-                st.session_state.config.PSIPRED_RESULTS_DIR_NAME = psipred_dir_name
-
-                st.session_state.config.save_settings()
-                st.success("✅ Configuration saved and synced to config.yaml")
-                st.rerun()
-            except Exception as e:
-                st.error(f"❌ Error saving config: {e}")
+
+        with st.expander("📝 Naming & Path Constraints (Advanced)"):
+            st.warning("Changing these may require re-organizing your input directory.")
+            col_adv1, col_adv2 = st.columns(2)
+            with col_adv1:
+                seq_code = st.text_input("ALIGN_CODE_SEQUENCE", value=st.session_state.config.ALIGN_CODE_SEQUENCE)
+                chain_id = st.text_input("CHAIN_ID", value=st.session_state.config.CHAIN_ID)
+                blk_chain = st.text_input("BLK_CHAIN_ID", value=st.session_state.config.BLK_CHAIN_ID)
+                fasta_base = st.text_input("FASTA_FILE_BASENAME", value=st.session_state.config.FASTA_FILE_BASENAME)
+                ss2_base = st.text_input("SS2_FILE_BASENAME", value=st.session_state.config.SS2_FILE_BASENAME)
+                manual_ali_base = st.text_input("MANUAL_ALIGNMENT_BASENAME", value=st.session_state.config.MANUAL_ALIGNMENT_BASENAME)
+            with col_adv2:
+                ini_base = st.text_input("CUSTOM_INIFILE_BASENAME", value=st.session_state.config.CUSTOM_INIFILE_BASENAME)
+                rsr_base = st.text_input("CUSTOM_RSRFILE_BASENAME", value=st.session_state.config.CUSTOM_RSRFILE_BASENAME)
+                input_dir_name = st.text_input("INPUT_DIR_NAME", value=st.session_state.config.INPUT_DIR_NAME)
+                modeling_dir_name = st.text_input("MODELING_RESULTS_DIR_NAME", value=st.session_state.config.MODELING_RESULTS_DIR_NAME)
+                psipred_dir_name = st.text_input("PSIPRED_RESULTS_DIR_NAME", value=st.session_state.config.PSIPRED_RESULTS_DIR_NAME)
+
+        st.markdown("---")
+        submitted = st.form_submit_button("💾 Save All Configuration", width='stretch')
+
+    if submitted:
+        try:
+            updates = {
+                "TOTAL_HOMOLOGY_MODELS": total_models,
+                "TOP_MODELS_FOR_REFINEMENT": top_refine,
+                "LOOP_MODELS_PER_TARGET": loop_models,
+                "MOBILE_FLANK_RESIDUES": flank_size,
+                "BLOCK_REPULSION_RADIUS": repulsion,
+                "REFINE_FLANKS_DURING_AUTOMODEL": refine_flanks,
+                "NUM_BEST_FINAL_MODELS": int(best_final) if best_final.isdigit() else best_final,
+
+                "PERFORM_PSIPRED_PREDICTION": psipred_pred,
+                "PSIPRED_EMAIL": psipred_email,
+                "PSIPRED_POLL_INTERVAL": psipred_poll,
+                "USE_MANUAL_ALIGNMENT": use_manual_ali,
+
+                "EXECUTION_PARADIGM": paradigm,
+                "MODELLER_CORES": modeller_cores,
+                "TOTAL_PARALLEL_JOBS": parallel_jobs,
+                "USE_MANUAL_OPTIMIZATION_SELECTION": manual_opt,
+                "USE_MANUAL_FIXATION_SELECTION": manual_fix,
+
+                "MANUAL_OPTIMIZATION_RESIDUES": [int(r) for r in opt_res_str.split()] if manual_opt else [],
+                "MANUAL_FIXATION_RESIDUES": [int(r) for r in fix_res_str.split()] if manual_fix else [],
+                "PDB_TEMPLATE_FILES_NAMES": [n.strip() for n in pdb_names_str.split("\n") if n.strip()],
+
+                "ALIGN_CODE_SEQUENCE": seq_code,
+                "CHAIN_ID": chain_id,
+                "BLK_CHAIN_ID": blk_chain,
+                "FASTA_FILE_BASENAME": fasta_base,
+                "SS2_FILE_BASENAME": ss2_base,
+                "MANUAL_ALIGNMENT_BASENAME": manual_ali_base,
+
+                "CUSTOM_INIFILE_BASENAME": ini_base,
+                "CUSTOM_RSRFILE_BASENAME": rsr_base,
+                "INPUT_DIR_NAME": input_dir_name,
+                "MODELING_RESULTS_DIR_NAME": modeling_dir_name,
+                "PSIPRED_RESULTS_DIR_NAME": psipred_dir_name,
+            }
+            if paradigm == "prism-power":
+                updates["PRISM_POWER_SETTINGS"] = json.loads(power_json)
+
+            # One validation pass for the whole form instead of field-by-field assignment
+            st.session_state.config = st.session_state.config.with_updates(updates)
+            st.session_state.config.save_settings()
+            _load_config.clear()
+            st.success("✅ Configuration saved and synced to config.yaml")
+            st.rerun()
+        except Exception as e:
+            st.error(f"❌ Error saving config: {e}")
+
+@st.fragment
+def render_inventory(input_dir: str):
+    # Runs as a fragment so a delete only reruns the inventory, not every tab
+    files = _cached_list_files(input_dir, _mtime(input_dir))
+    if files:
+        for f in files:
+            c1, c2, c3, c4 = st.columns([3, 1, 2, 1])
+            with c1: st.text(f["name"])
+            with c2: st.text(f["size"])
+            with c3: st.text(f["modified"])
+            with c4:
+                if st.button("🗑️", key=f"del_{f['name']}", help=f"Delete {f['name']}"):
+                    if delete_path(os.path.join(input_dir, f["name"])):
+                        st.success(f"Deleted {f['name']}")
+                        st.rerun(scope="fragment")
+    else:
+        st.info("No files found in input/ directory.")
 
 with tab_files:
     st.header("Input Data Management")
@@ -279,20 +362,7 @@ with tab_files:
     
     with col_inv:
         st.subheader("📁 `input/` Directory Inventory")
-        files = list_files_in_dir(st.session_state.config.INPUT_DIR)
-        if files:
-            for f in files:
-                c1, c2, c3, c4 = st.columns([3, 1, 2, 1])
-                with c1: st.text(f["name"])
-                with c2: st.text(f["size"])
-                with c3: st.text(f["modified"])
-                with c4:
-                    if st.button("🗑️", key=f"del_{f['name']}", help=f"Delete {f['name']}"):
-                        if delete_path(os.path.join(st.session_state.config.INPUT_DIR, f["name"])):
-                            st.success(f"Deleted {f['name']}")
-                            st.rerun()
-        else:
-            st.info("No files found in input/ directory.")
+        render_inventory(st.session_state.config.INPUT_DIR)
 
     with col_up:
         st.subheader("📤 Upload Files")
@@ -345,8 +415,8 @@ with tab_viz:
         folder = st.radio("Search Folder", ["input", "modeling_results"])
         target_dir = st.session_state.config.INPUT_DIR if folder == "input" else st.session_state.config.MODELING_RESULTS_DIR
         
-        if os.path.exists(target_dir):
-            file_list = [f for f in os.listdir(target_dir) if f.endswith(".pdb")]
+        file_list = _cached_scan(target_dir, ".pdb", _mtime(target_dir))
+        if file_list is not None:
             selected_pdb = st.selectbox("Select PDB File", file_list)
             
             st.divider()
@@ -360,7 +430,7 @@ with tab_viz:
         if selected_pdb:
             st.caption(f"Viewing: {selected_pdb} in {folder}/")
             pdb_path = os.path.join(target_dir, selected_pdb)
-            html_data = visualize_pdb(pdb_path, style=style, color=color)
+            html_data = _cached_visualize(pdb_path, _mtime(pdb_path), style, color)
             components.html(html_data, height=600)
 
 with tab_exec:
@@ -370,16 +440,23 @@ with tab_exec:
     if st.button("🚀 Start PRISM Pipeline"):
         process = run_nextflow()
         log_area = st.empty()
-        logs = ""
+        # Keep only the tail and redraw at most every LOG_FLUSH_INTERVAL seconds
+        logs = deque(maxlen=LOG_TAIL_LINES)
+        last_flush = time.monotonic()
         for line in get_nextflow_progress(process):
-            logs += line
-            log_area.text_area("Nextflow Real-time Logs", logs, height=500)
+            logs.append(line)
+            if time.monotonic() - last_flush > LOG_FLUSH_INTERVAL:
+                log_area.code("".join(logs), language=None)
+                last_flush = time.monotonic()
+        log_area.code("".join(logs), language=None)
 
 with tab_results:
     st.header("Modeling Performance & Results")
-    results_df = get_score_distribution_data()
+    ranking_csv = st.session_state.config.FINAL_RANKING_CSV
+    results_df = _cached_score_data(ranking_csv, _mtime(ranking_csv))
     
     if results_df is not None:
+        go = _plotly_go()
         col_r1, col_r2 = st.columns([1, 1])
         
         with col_r1:
@@ -388,15 +465,21 @@ with tab_results:
             
         with col_r2:
             st.subheader("DOPEHR Score Distribution")
-            fig = px.bar(results_df, x="Model_Name", y="DOPEHR_score", 
-                         title="Score by Model (Lower is Better)",
-                         color="DOPEHR_score", color_continuous_scale="Viridis")
+            model_names = results_df["Model_Name"].astype(str).to_numpy()
+            dope_scores = results_df["DOPEHR_score"].to_numpy()
+            fig = go.Figure(go.Bar(x=model_names, y=dope_scores,
+                                   marker=dict(color=dope_scores, colorscale="Viridis", showscale=True)))
+            fig.update_layout(title="Score by Model (Lower is Better)",
+                              xaxis_title="Model_Name", yaxis_title="DOPEHR_score")
             st.plotly_chart(fig, width='stretch')
             
         st.markdown("---")
         st.subheader("Z-Score Analysis")
-        fig_z = px.scatter(results_df, x="DOPEHR_score", y="DOPEHR_zscore", 
-                           text="Model_Name", title="DOPEHR vs Z-Score")
+        fig_z = go.Figure(go.Scattergl(x=dope_scores,
+                                       y=results_df["DOPEHR_zscore"].to_numpy(),
+                                       text=model_names,
+                                       mode="markers+text"))
+        fig_z.update_layout(title="DOPEHR vs Z-Score", xaxis_title="DOPEHR_score", yaxis_title="DOPEHR_zscore")
         st.plotly_chart(fig_z, width='stretch')
     else:
         st.info("No ranking results found. Finish a pipeline run to see analytics.")
@@ -410,8 +493,8 @@ with tab_tools:
     """)
     
     tools_dir = "tools"
-    if os.path.exists(tools_dir):
-        tools = [f for f in os.listdir(tools_dir) if f.endswith(".py")]
+    tools = _cached_scan(tools_dir, ".py", _mtime(tools_dir))
+    if tools is not None:
         selected_tool = st.selectbox("Select Tool to Run", tools, help="Scripts located in the /tools folder")
         
         # 1. Initialize session state
@@ -473,8 +556,15 @@ with tab_tools:
         if st.button("🛠️ Execute Tool", use_container_width=True, type="primary"):
             with st.spinner(f"Running {selected_tool}..."):
                 final_args = st.session_state.args_input_key.split() if st.session_state.args_input_key else []
-                output = run_tool(selected_tool, final_args)
-                st.code(output, language="text")
+                output_area = st.empty()
+                output = deque(maxlen=LOG_TAIL_LINES)
+                last_flush = time.monotonic()
+                for line in stream_tool(selected_tool, final_args):
+                    output.append(line)
+                    if time.monotonic() - last_flush > LOG_FLUSH_INTERVAL:
+                        output_area.code("".join(output), language="text")
+                        last_flush = time.monotonic()
+                output_area.code("".join(output), language="text")
     else:
         st.error("Tools directory not found.")
 
@@ -543,14 +633,20 @@ with tab_file_mgmt:
     with action_col3:
         if st.button("📋 Copy", use_container_width=True, help="Copy selected items to destination"):
             if st.session_state.selected_paths and destination:
-                copied_count = 0
+                # Targets are claimed while the jobs are built: the copies run concurrently,
+                # so two selected items with the same basename must not share a target
+                copy_jobs = []
+                claimed = set()
                 for path in st.session_state.selected_paths:
                     target = os.path.join(destination, os.path.basename(path))
-                    if os.path.exists(target):
+                    if target in claimed or os.path.exists(target):
                         target = os.path.join(destination, f"copy_{os.path.basename(path)}")
-                        
-                    if copy_path(path, target):
-                        copied_count += 1
+                        if target in claimed or os.path.exists(target):
+                            st.error(f"Cannot copy {path}: {target} already exists")
+                            continue
+                    claimed.add(target)
+                    copy_jobs.append((path, target))
+                copied_count = copy_paths(copy_jobs)
                 st.session_state.selected_paths = []
                 st.success(f"Copied {copied_count} items to {destination}.")
                 st.rerun()
@@ -573,13 +669,13 @@ with tab_file_mgmt:
                         if directory in st.session_state.selected_paths:
                             st.session_state.selected_paths.remove(directory)
 
-                    dir_files = os.listdir(directory)
-                    if dir_files:
-                        for f in sorted(dir_files):
+                    with os.scandir(directory) as it:
+                        dir_entries = sorted(((e.name, e.is_dir()) for e in it), key=lambda e: e[0])
+                    if dir_entries:
+                        for f, is_dir in dir_entries:
                             if f.startswith("."): continue
                             
                             f_path = os.path.join(directory, f)
-                            is_dir = os.path.isdir(f_path)
                             icon = "📁" if is_dir else "📄"
                             
                             if st.checkbox(f"{icon} {f}", key=f"sel_f_{f_path}"):
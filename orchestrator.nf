@@ -39,6 +39,17 @@ params.execution_paradigm  = config_data.EXECUTION_PARADIGM
 params.rsr_file = config_data.CUSTOM_RSRFILE_PATH
 params.ini_file = config_data.CUSTOM_INIFILE_PATH
 
+// How every task stages the PRISM package and config.yaml (tasks only read them):
+//   copy     - independent full copy (default, works with any cp)
+//   reflink  - copy-on-write clone where the filesystem supports it, plain copy otherwise
+//              (needs GNU coreutils cp, e.g. on Linux)
+//   hardlink - shares the project's inodes; work dir must be on the same filesystem
+params.stage_mode = 'copy'
+def stageCp = [reflink: 'cp --reflink=auto', hardlink: 'cp -l', copy: 'cp'][params.stage_mode]
+if (!stageCp) {
+    error "Unknown stage_mode '${params.stage_mode}' (expected reflink, hardlink or copy)"
+}
+
 def flatPath = { filename -> file(filename).name }
 
 // --- 2. PROCESS DEFINITIONS ---
@@ -56,8 +67,8 @@ process PREREQ_CDE {
 
     script:
     """
-    cp -r ${projectDir}/PRISM .
-    cp ${projectDir}/config.yaml .
+    ${stageCp} -r ${projectDir}/PRISM .
+    ${stageCp} ${projectDir}/config.yaml .
     mkdir -p input modeling_results
     
     ln -sf ${projectDir}/input/* ./input/
@@ -91,8 +102,8 @@ process PRECALC_AUTOMODEL {
 
     script:
     """
-    cp -r ${projectDir}/PRISM .
-    cp ${projectDir}/config.yaml .
+    ${stageCp} -r ${projectDir}/PRISM .
+    ${stageCp} ${projectDir}/config.yaml .
     mkdir -p input modeling_results
     
     ln -sf ${projectDir}/input/* ./input/
@@ -125,8 +136,8 @@ process AUTOMODEL {
 
     script:
     """
-    cp -r ${projectDir}/PRISM .
-    cp ${projectDir}/config.yaml .
+    ${stageCp} -r ${projectDir}/PRISM .
+    ${stageCp} ${projectDir}/config.yaml .
     mkdir -p input modeling_results
 
     ln -sf ${projectDir}/modeling_results/* ./modeling_results/
@@ -155,8 +166,8 @@ process RANK_AUTOMODEL {
 
     script:
     """
-    cp -r ${projectDir}/PRISM .
-    cp ${projectDir}/config.yaml .
+    ${stageCp} -r ${projectDir}/PRISM .
+    ${stageCp} ${projectDir}/config.yaml .
     mkdir -p input 
     
     ln -sf ${projectDir}/input/* ./input/
@@ -185,8 +196,8 @@ process LOOP_MODEL {
 
     script:
     """
-    cp -r ${projectDir}/PRISM .
-    cp ${projectDir}/config.yaml .
+    ${stageCp} -r ${projectDir}/PRISM .
+    ${stageCp} ${projectDir}/config.yaml .
     mkdir -p input
     
     ln -sf ${projectDir}/input/* ./input/
@@ -216,8 +227,8 @@ process FINAL_RANKING {
 
     script:
     """
-    cp -r ${projectDir}/PRISM .
-    cp ${projectDir}/config.yaml .
+    ${stageCp} -r ${projectDir}/PRISM .
+    ${stageCp} ${projectDir}/config.yaml .
     mkdir -p input modeling_results
     
     ln -sf ${projectDir}/input/* ./input/
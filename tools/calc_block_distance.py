@@ -14,10 +14,41 @@ import argparse
 import os
 from typing import List, Tuple, Dict, Any
 
+import numpy as np
+from numba import njit
+
 from modeller import *
 from modeller.selection import Selection
 
 
+@njit(cache=True)
+def _nearest_centers(ca_coords, het_centers):
+    '''
+    For every CA row, returns the distance to the closest gravity center and that center's index.
+    Streams over the centers per CA, so memory stays O(n_ca) instead of a full (n_ca, n_het) matrix.
+    '''
+    n_ca = ca_coords.shape[0]
+    min_dists = np.empty(n_ca, np.float64)
+    closest_idx = np.empty(n_ca, np.int64)
+    for i in range(n_ca):
+        x = ca_coords[i, 0]
+        y = ca_coords[i, 1]
+        z = ca_coords[i, 2]
+        best = np.inf
+        best_j = 0
+        for j in range(het_centers.shape[0]):
+            dx = x - het_centers[j, 0]
+            dy = y - het_centers[j, 1]
+            dz = z - het_centers[j, 2]
+            d = dx * dx + dy * dy + dz * dz
+            if d < best:
+                best = d
+                best_j = j
+        min_dists[i] = np.sqrt(best)
+        closest_idx[i] = best_j
+    return min_dists, closest_idx
+
+
 def calculate_distances(pdb_file: str, protein_chain: str, blk_chain: str) -> List[Dict[str, Any]]:
     '''
     Load PDB, identify BLK residues, calculate gravity centers, and find min distances to CA atoms.
@@ -38,10 +69,15 @@ def calculate_distances(pdb_file: str, protein_chain: str, blk_chain: str) -> Li
         print(f"Available chains in PDB: {', '.join(available_chains)}")
         return []
 
-    # Calculate gravity centers
-    het_centers = []
-    for res in het_residues:
-        het_centers.append(res)
+    def get_gravity_center(residue):
+        atoms = residue.atoms
+        x = sum(a.x for a in atoms) / len(atoms)
+        y = sum(a.y for a in atoms) / len(atoms)
+        z = sum(a.z for a in atoms) / len(atoms)
+        return (x, y, z)
+
+    # Calculate gravity centers once (one row per BLK/HETATM residue)
+    het_centers = np.array([get_gravity_center(res) for res in het_residues], dtype=np.float64)
 
     # Get protein CA atoms
     try:
@@ -52,38 +88,24 @@ def calculate_distances(pdb_file: str, protein_chain: str, blk_chain: str) -> Li
         print(f"Available chains in PDB: {', '.join(available_chains)}")
         return []
 
-    protein_ca = Selection(prot_chain_obj).only_atom_types('CA')
+    protein_ca = list(Selection(prot_chain_obj).only_atom_types('CA'))
     if not protein_ca:
         print(f"No CA atoms found in chain {protein_chain}.")
         return []
 
-    results = []
-    
-    def get_gravity_center(residue):
-        atoms = residue.atoms
-        x = sum(a.x for a in atoms) / len(atoms)
-        y = sum(a.y for a in atoms) / len(atoms)
-        z = sum(a.z for a in atoms) / len(atoms)
-        return (x, y, z)
+    ca_coords = np.array([(ca.x, ca.y, ca.z) for ca in protein_ca], dtype=np.float64)
 
-    for ca in protein_ca:
-        ca_coord = (ca.x, ca.y, ca.z)
-        min_dist = float('inf')
-        closest_het = None
-        
-        for res in het_residues:
-            het_coord = get_gravity_center(res)
-            dist = ((ca_coord[0]-het_coord[0])**2 + (ca_coord[1]-het_coord[1])**2 + (ca_coord[2]-het_coord[2])**2)**0.5
-            if dist < min_dist:
-                min_dist = dist
-                closest_het = res
-        
+    min_dists, closest_idx = _nearest_centers(ca_coords, het_centers)
+
+    results = []
+    for ca, min_dist, het_idx in zip(protein_ca, min_dists.tolist(), closest_idx.tolist()):
+        closest_het = het_residues[het_idx]
         results.append({
             'residue_index': ca.residue.index,
             'residue_num': ca.residue.num,
             'residue_name': ca.residue.name,
             'min_distance': min_dist,
-            'closest_het': f"{closest_het.name}:{closest_het.num}:{closest_het.chain.name}" if closest_het else "N/A"
+            'closest_het': f"{closest_het.name}:{closest_het.num}:{closest_het.chain.name}"
         })
 
     return results
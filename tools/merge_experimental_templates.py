@@ -5,18 +5,28 @@
 import sys
 import argparse
 import os
+from array import array
+from itertools import accumulate
 from typing import Dict
 
 from Bio.PDB import PDBParser, Superimposer, PDBIO, Structure, Model, Chain
 
 def parse_pir_sequences(align_file: str):
-    '''Manual parsing of PIR file to get full alignment strings including gaps.'''
+    '''
+    Manual parsing of PIR file to get full alignment strings including gaps.
+    The header line following each '>P1;' code is returned too, so callers need a single pass.
+    '''
     sequences = {}
     all_codes = []
+    entry_headers = []
     curr_code = None
     curr_seq = []
+    expect_header = False
     with open(align_file, 'r') as f:
         for line in f:
+            if expect_header:
+                entry_headers.append((curr_code, line))
+                expect_header = False
             if line.startswith('>P1;'):
                 if curr_code:
                     sequences[curr_code] = "".join(curr_seq).replace('\n', '').replace(' ', '')
@@ -24,11 +34,12 @@ def parse_pir_sequences(align_file: str):
                 descript_code = curr_code.split('_')[0]
                 all_codes.append(descript_code)
                 curr_seq = []
+                expect_header = True
             elif curr_code and not line.startswith(('structure', 'sequence', ' ')):
                 curr_seq.append(line.strip().rstrip('*'))
         if curr_code:
             sequences[curr_code] = "".join(curr_seq).replace('\n', '').replace(' ', '')
-    return sequences, all_codes
+    return sequences, all_codes, entry_headers
 
 def get_all_residues(structure):
     '''
@@ -37,7 +48,7 @@ def get_all_residues(structure):
     return list(structure[0].get_residues())
 
 def merge_structures(align_file: str, ref_code: str, output_pdb: str = None):
-    pir_seqs, all_codes = parse_pir_sequences(align_file)
+    pir_seqs, all_codes, entry_headers = parse_pir_sequences(align_file)
     print(f"PIR sequences found: {list(pir_seqs.keys())}")
     
     if not output_pdb:
@@ -49,16 +60,11 @@ def merge_structures(align_file: str, ref_code: str, output_pdb: str = None):
     target_code = None
     templates = []
     
-    with open(align_file, 'r') as f:
-        lines = f.readlines()
-        for i, line in enumerate(lines):
-            if line.startswith('>P1;'):
-                code = line[4:].strip()
-                type_line = lines[i+1]
-                if type_line.startswith('sequence:'):
-                    target_code = code
-                elif type_line.startswith('structure') and code != ref_code:
-                    templates.append(code)
+    for code, type_line in entry_headers:
+        if type_line.startswith('sequence:'):
+            target_code = code
+        elif type_line.startswith('structure') and code != ref_code:
+            templates.append(code)
 
     if ref_code not in pir_seqs:
         print(f"Error: Reference model '{ref_code}' not found in alignment.")
@@ -136,29 +142,43 @@ def merge_structures(align_file: str, ref_code: str, output_pdb: str = None):
     merged_structure.add(merged_model)
     
     current_res_seq = 0
+
+    # Residue lists are collected once per template, and each template's residue index at every
+    # column (non-gap characters before it) is a prefix-count array built up front, so the column
+    # loop needs no per-template counter updates.
+    transformed_residues = {t_code: get_all_residues(structure) for t_code, structure in transformed_structures.items()}
+    temp_res_offsets = {
+        t_code: array('i', accumulate((c != '-' for c in pir_seqs[t_code]), initial=0))
+        for t_code in transformed_residues
+    }
     
-    for pos in range(len(target_seq)):
-        if target_seq[pos] in ('-', '.', '/'): 
-            continue
-        
+    # One scan over the template columns serves both outputs: the first template with a residue
+    # gives the merged alignment character, the first superposed one supplies the coordinates.
+    merged_seq = []
+    for pos, target_char in enumerate(target_seq):
+        merged_char = '-'
         chosen_temp = None
         for t_code in templates:
-            if t_code in transformed_structures and pir_seqs[t_code][pos] != '-':
+            char = pir_seqs[t_code][pos]
+            if char == '-':
+                continue
+            if merged_char == '-':
+                merged_char = char
+            if t_code in transformed_residues:
                 chosen_temp = t_code
                 break
+        merged_seq.append(merged_char)
+
+        if target_char not in ('-', '.', '/'):
+            if chosen_temp:
+                temp_res_idx = temp_res_offsets[chosen_temp][pos]
+                temp_residues = transformed_residues[chosen_temp]
                 
-        if chosen_temp:
-            temp_seq_up_to_pos = pir_seqs[chosen_temp][:pos]
-            temp_res_idx = len(temp_seq_up_to_pos.replace('-', ''))
-            
-            temp_structure = transformed_structures[chosen_temp]
-            temp_residues = get_all_residues(temp_structure)
-            
-            if temp_res_idx < len(temp_residues):
-                current_res_seq += 1
-                res_to_copy = temp_residues[temp_res_idx].copy()
-                res_to_copy.id = (' ', current_res_seq, ' ')
-                merged_chain.add(res_to_copy)
+                if temp_res_idx < len(temp_residues):
+                    current_res_seq += 1
+                    res_to_copy = temp_residues[temp_res_idx].copy()
+                    res_to_copy.id = (' ', current_res_seq, ' ')
+                    merged_chain.add(res_to_copy)
 
     if templates and templates[0] in transformed_structures:
         first_temp = transformed_structures[templates[0]]
@@ -179,12 +199,6 @@ def merge_structures(align_file: str, ref_code: str, output_pdb: str = None):
     print(f"Merged experimental PDB written to {output_pdb}")
     
     output_ali = align_file.replace('.ali', '_merged.ali')
-    merged_seq = list('-' * len(target_seq))
-    for pos in range(len(target_seq)):
-        for t_code in templates:
-            if pir_seqs[t_code][pos] != '-':
-                merged_seq[pos] = pir_seqs[t_code][pos]
-                break
                 
     with open(output_ali, 'w') as f:
         f.write(f">P1;{output_pdb}\n")
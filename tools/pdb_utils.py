@@ -8,33 +8,63 @@
 Shared tools module for PRISM. Includes PDBAtom class for parsing PDB records.
 '''
 
+import struct
+
+# Fixed ATOM/HETATM columns 1-78 (record, serial, name, altLoc, resName, chainID, resSeq, iCode,
+# x, y, z, occupancy, tempFactor, element), unpacked in one call from a record padded to 80 bytes.
+# Records are converted with latin-1: every character maps to one byte, so any input decodes
+# and the fixed columns stay aligned
+PDB_ATOM_STRUCT = struct.Struct('6s5sx4s1s3sx1s4s1s3x8s8s8s6s6s10x2s')
+PDB_LINE_WIDTH = 80
+
+def pdb_atom_name_field(name):
+    '''
+    Formats an atom name into the 4-character PDB column: 4-character names fill it, names
+    starting with a digit are left-aligned, all others start in column 14.
+    '''
+    if len(name) == 4:
+        return name
+    if name[0].isdigit():
+        return f"{name:<4}"
+    return f" {name:<3}"
+
 class PDBAtom:
     def __init__(self, line):
+        self._set_fields(line, line.encode('latin-1', 'replace'))
+
+    @classmethod
+    def from_bytes(cls, line_bytes):
+        '''
+        Builds an atom straight from a raw PDB record, skipping the str -> bytes encode.
+        '''
+        atom = cls.__new__(cls)
+        atom._set_fields(line_bytes.decode('latin-1'), line_bytes)
+        return atom
+
+    def _set_fields(self, line, line_bytes):
+        (record_type, serial, name, alt_loc, res_name, chain_id, res_seq, i_code,
+         x, y, z, occ, temp, element) = PDB_ATOM_STRUCT.unpack_from(line_bytes.ljust(PDB_LINE_WIDTH))
         self.line = line
-        self.record_type = line[0:6].strip()
+        self.record_type = record_type.strip().decode('latin-1')
         try:
-            self.serial = int(line[6:11])
+            self.serial = int(serial)
         except ValueError: self.serial = 0
-        self.name = line[12:16] 
-        self.alt_loc = line[16]
-        self.res_name = line[17:20].strip()
-        self.chain_id = line[21]
+        self.name = name.decode('latin-1')
+        self.alt_loc = alt_loc.decode('latin-1')
+        self.res_name = res_name.strip().decode('latin-1')
+        self.chain_id = chain_id.decode('latin-1')
         try:
-            self.res_seq = int(line[22:26])
+            self.res_seq = int(res_seq)
         except ValueError: self.res_seq = 0
-        self.i_code = line[26]
-        self.x = float(line[30:38])
-        self.y = float(line[38:46])
-        self.z = float(line[46:54])
-        self.occ = float(line[54:60]) if len(line) > 54 and line[54:60].strip() else 1.00
-        self.temp = float(line[60:66]) if len(line) > 60 and line[60:66].strip() else 0.00
-        self.element = line[76:78].strip() if len(line) > 76 else ""
+        self.i_code = i_code.decode('latin-1')
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+        self.occ = float(occ) if occ.strip() else 1.00
+        self.temp = float(temp) if temp.strip() else 0.00
+        self.element = element.strip().decode('latin-1')
 
     def to_pdb_line(self):
-        if len(self.name) == 4:
-            name_str = f"{self.name}"
-        else:
-            if self.name[0].isdigit(): name_str = f"{self.name:<4}"
-            else: name_str = f" {self.name:<3}"
+        name_str = pdb_atom_name_field(self.name)
         return (f"{self.record_type:<6}{self.serial:>5} {name_str:4}{self.alt_loc}{self.res_name:>3} {self.chain_id}{self.res_seq:>4}{self.i_code}   "
                 f"{self.x:>8.3f}{self.y:>8.3f}{self.z:>8.3f}{self.occ:>6.2f}{self.temp:>6.2f}          {self.element:>2}")
@@ -3,13 +3,19 @@ import argparse
 import sys
 import os
 import json
+import re
 
 # ====================================================================================
 #                                   CLASSES
 # ====================================================================================
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from pdb_utils import PDBAtom
+from pdb_utils import PDBAtom, pdb_atom_name_field
+
+ATOM_RECORDS = (b'ATOM', b'HETATM')
+CHAIN_B = ord('B')
+TER_LINE = b"TER\n"
+END_LINE = b"END\n"
 
 # ====================================================================================
 #                                 HELPER FUNCTIONS
@@ -39,6 +45,17 @@ def format_atom_name_blk(counter):
     '''
     return f"X{counter}"
 
+def atom_records_re(chains):
+    '''
+    Compiles a multiline regex matching whole ATOM/HETATM lines whose chain (column 22)
+    is one of the given single-character chain IDs. Group 1 is the chain byte.
+    '''
+    ids = sorted({c for c in chains if len(c) == 1})
+    if not ids:
+        return re.compile(rb'(?!)')
+    chain_class = b''.join(re.escape(c.encode()) for c in ids)
+    return re.compile(rb'^(?=ATOM|HETATM)[^\n]{21}([' + chain_class + rb'])[^\n]*\n?', re.M)
+
 # ====================================================================================
 #                                   PREP LOGIC
 # ====================================================================================
@@ -60,15 +77,16 @@ def run_prep(input_path, prot_chains_str, lig_chains_str):
     protein_atoms = []
     ligand_atoms = []
 
-    # 1. Read Atoms
-    with open(input_path, 'r') as f:
-        for line in f:
-            if line.startswith(('ATOM', 'HETATM')):
-                chain = line[21]
-                if chain in prot_chains:
-                    protein_atoms.append(PDBAtom(line))
-                elif chain in lig_chains:
-                    ligand_atoms.append(PDBAtom(line))
+    # 1. Read Atoms (one regex scan in C picks ATOM/HETATM records of the selected chains)
+    prot_chains_b = {c.encode() for c in prot_chains}
+    with open(input_path, 'rb') as f:
+        data = f.read()
+    for m in atom_records_re(prot_chains + lig_chains).finditer(data):
+        atom = PDBAtom.from_bytes(m.group(0))
+        if m.group(1) in prot_chains_b:
+            protein_atoms.append(atom)
+        else:
+            ligand_atoms.append(atom)
 
     # 2. Prepare Data Structures
     new_chain_a_lines = []
@@ -87,28 +105,33 @@ def run_prep(input_path, prot_chains_str, lig_chains_str):
     current_res_seq = 0
     prev_id = None
     
+    # Each parsed atom is emitted once: log its original fields, then rewrite it in place
+    # (no PDBAtom re-parse per atom), with the per-atom appends bound to locals
+    protein_map_append = log_data["protein_map"].append
+    chain_a_append = new_chain_a_lines.append
+
     for atom in protein_atoms:
         curr_id = (atom.chain_id, atom.res_seq, atom.i_code)
         if curr_id != prev_id:
             current_res_seq += 1
         
-        new_atom = PDBAtom(atom.line)
-        new_atom.serial = current_serial
-        new_atom.chain_id = 'A'
-        new_atom.res_seq = current_res_seq
-        new_atom.record_type = "ATOM  "
-        
-        log_data["protein_map"].append({
+        atom_name = atom.name.strip()
+        protein_map_append({
             "new_chain": "A",
             "new_res_seq": current_res_seq,
-            "new_atom_name": new_atom.name.strip(),
+            "new_atom_name": atom_name,
             "orig_chain": atom.chain_id,
             "orig_res_name": atom.res_name,
             "orig_res_seq": atom.res_seq,
-            "orig_atom_name": atom.name.strip()
+            "orig_atom_name": atom_name
         })
         
-        new_chain_a_lines.append(new_atom.to_pdb_line())
+        atom.serial = current_serial
+        atom.chain_id = 'A'
+        atom.res_seq = current_res_seq
+        atom.record_type = "ATOM  "
+        
+        chain_a_append(atom.to_pdb_line())
         current_serial += 1
         prev_id = curr_id
 
@@ -116,6 +139,8 @@ def run_prep(input_path, prot_chains_str, lig_chains_str):
     prev_id = None
     atom_counter = 1
     log_res_seq = 0
+    ligand_map = log_data["ligand_map"]
+    chain_b_append = new_chain_b_lines.append
     
     for atom in ligand_atoms:
         curr_id = (atom.chain_id, atom.res_seq, atom.i_code)
@@ -126,18 +151,7 @@ def run_prep(input_path, prot_chains_str, lig_chains_str):
         
         new_name = format_atom_name_blk(atom_counter)
         
-        new_atom = PDBAtom(atom.line)
-        new_atom.serial = current_serial
-        new_atom.chain_id = 'B'
-        new_atom.res_name = 'BLK'
-        new_atom.res_seq = current_res_seq
-        new_atom.name = new_name
-        new_atom.element = "X"
-        new_atom.temp = 99.99
-        new_atom.record_type = "HETATM"
-        
-        key = f"{log_res_seq}_{new_name}"
-        log_data["ligand_map"][key] = {
+        ligand_map[f"{log_res_seq}_{new_name}"] = {
             "orig_chain": atom.chain_id,
             "orig_res_name": atom.res_name,
             "orig_res_seq": atom.res_seq,
@@ -146,7 +160,16 @@ def run_prep(input_path, prot_chains_str, lig_chains_str):
             "orig_record": atom.record_type.strip()
         }
 
-        new_chain_b_lines.append(new_atom.to_pdb_line())
+        atom.serial = current_serial
+        atom.chain_id = 'B'
+        atom.res_name = 'BLK'
+        atom.res_seq = current_res_seq
+        atom.name = new_name
+        atom.element = "X"
+        atom.temp = 99.99
+        atom.record_type = "HETATM"
+
+        chain_b_append(atom.to_pdb_line())
         current_serial += 1
         atom_counter += 1
         prev_id = curr_id
@@ -156,12 +179,17 @@ def run_prep(input_path, prot_chains_str, lig_chains_str):
     out_pdb = f"{base}_prism_prep.pdb"
     out_log = f"{base}_prism_data.json"
 
-    with open(out_pdb, 'w') as f:
-        for l in new_chain_a_lines: f.write(l + "\n")
-        if new_chain_a_lines: f.write("TER\n")
-        for l in new_chain_b_lines: f.write(l + "\n")
-        if new_chain_b_lines: f.write("TER\n")
-        f.write("END\n")
+    # Each chain is encoded once (latin-1, as PDBAtom reads it) into one output buffer, the
+    # TER/END records are extended in as bytes and the file is written in binary mode
+    buf = bytearray()
+    for chain_lines in (new_chain_a_lines, new_chain_b_lines):
+        if chain_lines:
+            buf += "\n".join(chain_lines).encode('latin-1')
+            buf += b"\n"
+            buf += TER_LINE
+    buf += END_LINE
+    with open(out_pdb, 'wb') as f:
+        f.write(buf)
 
     with open(out_log, 'w') as f:
         json.dump(log_data, f, indent=4)
@@ -191,59 +219,63 @@ def run_retro(model_path, original_path, log_path):
     with open(log_path, 'r') as f:
         log_data = json.load(f)
     
-    ligand_map = log_data.get("ligand_map", {})
+    lm_get = log_data.get("ligand_map", {}).get
 
-    restored_lines = []
+    buf = bytearray()
+    ext = buf.extend
     log_res_seq = 0
     atom_counter = 1
     prev_id = None
     
-    with open(model_path, 'r') as f:
-        for line in f:
-            if not line.startswith(('ATOM', 'HETATM')):
-                restored_lines.append(line.strip())
-                continue
-
-            atom = PDBAtom(line)
-
-            # --- RESTORE LIGAND (Chain B) ---
-            if atom.chain_id == 'B':
-                curr_id = (atom.chain_id, atom.res_seq, atom.i_code)
-                if curr_id != prev_id:
-                    log_res_seq += 1
-                    atom_counter = 1
-                key = f"{log_res_seq}_{atom.name.strip()}"
-                
-                if key in ligand_map:
-                    info = ligand_map[key]
-                    
-                    # Restore Identity
-                    atom.chain_id = info['orig_chain']
-                    atom.res_name = info['orig_res_name']
-                    atom.res_seq = info['orig_res_seq']
-                    atom.name = info['orig_atom_name']
-                    atom.element = info['orig_element']
-                    atom.record_type = f"{info['orig_record']:<6}"
-                    
-                    atom.temp = 0.00 
-                    atom_counter += 1
-                    prev_id = curr_id
-                else:
-                    print(f"[RETRO] Warning: No map found for Chain B atom {key}. Keeping as is.")
-
-            # --- PROTEIN (Chain A) ---
-            # Only for ligand_chains since protein chains could have changed
-            # We keep Chain A as is (output from Modeller).
-            
-            restored_lines.append(atom.to_pdb_line())
+    with open(model_path, 'rb', buffering=1 << 20) as f:
+        data = f.read()
+
+    for raw in data.splitlines():
+        if not raw.startswith(ATOM_RECORDS):
+            ext(raw.strip())
+            buf.append(10)
+            continue
+
+        # --- PROTEIN (Chain A) ---
+        # Only for ligand_chains since protein chains could have changed
+        # We keep Chain A as is (output from Modeller).
+        if len(raw) <= 21 or raw[21] != CHAIN_B:
+            ext(raw.rstrip())
+            buf.append(10)
+            continue
+
+        # --- RESTORE LIGAND (Chain B) ---
+        curr_id = raw[22:27]
+        if curr_id != prev_id:
+            log_res_seq += 1
+            atom_counter = 1
+        key = f"{log_res_seq}_{raw[12:16].strip().decode('ascii', 'replace')}"
+        
+        info = lm_get(key)
+        if info is not None:
+            # Restore Identity (fixed-width column splice)
+            rec = bytearray(raw.rstrip().ljust(78))
+            rec[0:6] = f"{info['orig_record']:<6}".encode()
+            rec[12:16] = pdb_atom_name_field(info['orig_atom_name']).encode()
+            rec[17:20] = f"{info['orig_res_name']:>3}".encode()
+            rec[21:22] = info['orig_chain'].encode()
+            rec[22:26] = f"{info['orig_res_seq']:>4}".encode()
+            rec[60:66] = b'  0.00'
+            rec[76:78] = f"{info['orig_element']:>2}".encode()
+            ext(rec)
+            atom_counter += 1
+            prev_id = curr_id
+        else:
+            print(f"[RETRO] Warning: No map found for Chain B atom {key}. Keeping as is.")
+            ext(raw.rstrip())
+        buf.append(10)
 
     # Output
     base_model = os.path.splitext(os.path.basename(model_path))[0]
     out_name = f"{base_model}_restored.pdb"
     
-    with open(out_name, 'w') as f:
-        for line in restored_lines:
-            f.write(line + "\n")
+    with open(out_name, 'wb') as f:
+        f.write(buf)
     
     print(f"[RETRO] Success! Restored file saved as: {out_name}")
 
@@ -6,10 +6,47 @@ import os
 import sys
 import argparse
 import re
+import math
+import array
 from typing import Dict, List, Tuple, Set
+
+import numpy as np
+from numba import njit
 from modeller import *
 
+_PIR_RE = re.compile(r'^>P1;(\S+)[ \t]*\r?\n[ \t]*([^\r\n]*)\r?\n(.*?)(?=^>P1;|\Z)', re.M | re.S)
+_SEQ_WHITESPACE = {ord(c): None for c in ' \t\r\n'}
+
+@njit(cache=True)
+def _scan_alignment(t, q):
+    '''
+    Walks two aligned byte sequences and returns the residue numbers (template, target)
+    of every column where both have a residue. '-' (45), '/' (47) and '*' (42) do not
+    advance the residue counters; '.' (46) counts but is never matched.
+    '''
+    n = min(t.size, q.size)
+    t_idx = np.empty(n, np.int32)
+    q_idx = np.empty(n, np.int32)
+    k = 0
+    t_res_count = 0
+    q_res_count = 0
+    for i in range(n):
+        a = t[i]
+        b = q[i]
+        if a != 45 and a != 47 and a != 42:
+            t_res_count += 1
+        if b != 45 and b != 47 and b != 42:
+            q_res_count += 1
+        if a != 45 and a != 47 and a != 46 and b != 45 and b != 47 and b != 46:
+            t_idx[k] = t_res_count
+            q_idx[k] = q_res_count
+            k += 1
+    return t_idx[:k], q_idx[:k]
+
 class PrismVerify:
+    # Reference CA coordinates shared across instances: {(path, mtime): {(chain, resnum): (pdb_name, x, y, z)}}
+    _ref_ca_cache: Dict[Tuple[str, float], Dict[Tuple[str, str], Tuple[str, float, float, float]]] = {}
+
     def __init__(self, original_pdb: str, model_pdb: str, align_file: str):
         self.original_pdb = original_pdb
         self.model_pdb = model_pdb
@@ -26,6 +63,25 @@ class PrismVerify:
         self.env.io.atom_files_directory = ['.']
         log.none()
 
+    def _reference_ca(self) -> Dict[Tuple[str, str], Tuple[str, float, float, float]]:
+        '''
+        Returns the CA coordinates of the original PDB, reading it only once per file version.
+        '''
+        key = (os.path.abspath(self.original_pdb), os.path.getmtime(self.original_pdb))
+        ref_ca = PrismVerify._ref_ca_cache.get(key)
+        if ref_ca is None:
+            mdl_orig = Model(self.env)
+            mdl_orig.read(file=self.original_pdb)
+            ref_ca = {}
+            for res in mdl_orig.residues:
+                try:
+                    ca = res.atoms['CA']
+                except KeyError:
+                    continue
+                ref_ca[(res.chain.name, res.num)] = (res.pdb_name, ca.x, ca.y, ca.z)
+            PrismVerify._ref_ca_cache[key] = ref_ca
+        return ref_ca
+
     def parse_pir_alignment(self, template_code: str) -> Tuple[str, str]:
         '''
         Parses PIR file to find the template and target sequences.
@@ -37,21 +93,27 @@ class PrismVerify:
         with open(self.align_file, 'r') as f:
             content = f.read()
 
-        blocks = content.split('>P1;')
         template_seq = ""
         target_seq = ""
 
-        for block in blocks[1:]:
-            lines = block.strip().splitlines()
-            code = lines[0].strip()
-            header = lines[1].strip()
-            sequence = "".join([l.strip() for l in lines[2:] if l.strip() and not l.startswith('#')])
+        for match in _PIR_RE.finditer(content):
+            code, header, body = match.groups()
+            if code != template_code and not header.startswith('sequence:'):
+                continue
+
+            if '#' in body:
+                # Drop comment lines (e.g. CDE) in the same pass that joins the rest
+                body = ''.join([l for l in body.splitlines() if l[:1] != '#'])
+            sequence = body.translate(_SEQ_WHITESPACE)
             
             if code == template_code:
                 template_seq = sequence
-            elif header.startswith('sequence:'):
+            else:
                 target_seq = sequence
 
+            if template_seq and target_seq:
+                break
+
         if not template_seq or not target_seq:
             sys.exit(f"❌ Error: Could not find template '{template_code}' or target sequence in alignment.")
 
@@ -63,67 +125,70 @@ class PrismVerify:
         '''
         t_seq, q_seq = self.parse_pir_alignment(template_code)
         
-        mapping = {}
-        t_res_count = 0
-        q_res_count = 0
-
-        for t_char, q_char in zip(t_seq, q_seq):
-            if t_char not in ('-', '/', '*'): t_res_count += 1
-            if q_char not in ('-', '/', '*'): q_res_count += 1
-
-            if t_char not in ('-', '/', '.') and q_char not in ('-', '/', '.'):
-                mapping[t_res_count] = q_res_count
-
-        return mapping
+        t_idx, q_idx = _scan_alignment(
+            np.frombuffer(t_seq.encode('ascii'), dtype=np.uint8),
+            np.frombuffer(q_seq.encode('ascii'), dtype=np.uint8)
+        )
+        return dict(zip(t_idx.tolist(), q_idx.tolist()))
 
     def run_rmsd_check(self, mapping: Dict[int, int], orig_chain: str, mod_chain: str):
         '''
         Calculates CA RMSD using Modeller models.
         '''
-        mdl_orig = Model(self.env)
-        mdl_orig.read(file=self.original_pdb)
+        ref_ca = self._reference_ca()
         
         mdl_mod = Model(self.env)
         mdl_mod.read(file=self.model_pdb)
 
-        results = []
-        total_sq_diff = 0
-        count = 0
+        names = []
+        positions = []
+        orig_xyz = array.array('d')
+        mod_xyz = array.array('d')
 
         print(f"\n{'='*80}")
         print(f"{'RESIDUE':<15} | {'ORIG POS':<10} | {'MOD POS':<10} | {'RMSD (Å)':<10}")
         print("-" * 80)
 
-        for t_idx, q_idx in sorted(mapping.items()):
+        t_keys = np.fromiter(mapping.keys(), dtype=np.int64, count=len(mapping))
+        q_vals = np.fromiter(mapping.values(), dtype=np.int64, count=len(mapping))
+        order = t_keys.argsort(kind='stable')
+
+        for t_idx, q_idx in zip(t_keys[order].tolist(), q_vals[order].tolist()):
+            ref = ref_ca.get((orig_chain, str(t_idx)))
+            if ref is None:
+                # Gaps or missing atoms in original PDB
+                continue
             try:
-                res_o = mdl_orig.residues[f'{t_idx}:{orig_chain}']
                 res_m = mdl_mod.residues[f'{q_idx}:{mod_chain}']
-                
-                ca_o = res_o.atoms['CA']
                 ca_m = res_m.atoms['CA']
                 
-                dist = ((ca_o.x - ca_m.x)**2 + (ca_o.y - ca_m.y)**2 + (ca_o.z - ca_m.z)**2)**0.5
-                
-                status = "✓" if dist < 0.01 else "!"
-                print(f"{status} {res_o.pdb_name:<13} | {t_idx:<10} | {q_idx:<10} | {dist:.6f}")
-                
-                results.append(dist)
-                total_sq_diff += dist**2
-                count += 1
+                mod_xyz.extend((ca_m.x, ca_m.y, ca_m.z))
+                orig_xyz.extend(ref[1:])
+                names.append(ref[0])
+                positions.append((t_idx, q_idx))
             except Exception:
                 # Gaps or missing atoms in PDB
                 continue
 
+        count = len(names)
         if count == 0:
             print("❌ No matching residues found for comparison.")
             return
 
-        avg_rmsd = sum(results) / count
-        max_rmsd = max(results)
+        diffs = (np.frombuffer(orig_xyz, dtype=np.float64) - np.frombuffer(mod_xyz, dtype=np.float64)).reshape(count, 3)
+        sq = np.einsum('ij,ij->i', diffs, diffs)
+        dists = np.sqrt(sq)
+
+        for name, (t_idx, q_idx), dist in zip(names, positions, dists.tolist()):
+            status = "✓" if dist < 0.01 else "!"
+            print(f"{status} {name:<13} | {t_idx:<10} | {q_idx:<10} | {dist:.6f}")
+
+        rmsd = math.sqrt(sq.mean())
+        max_rmsd = float(dists.max())
         
         print("-" * 80)
         print(f"SUMMARY for {count} residues:")
-        print(f" > Average RMSD: {avg_rmsd:.6f} Å")
+        print(f" > CA RMSD:      {rmsd:.6f} Å")
         print(f" > Maximum RMSD: {max_rmsd:.6f} Å")
         
         if max_rmsd < 0.01:
@@ -10,6 +10,7 @@ Usage (from project root):
     python3 tools/run_alignment.py
 """
 
+import re
 import sys
 import shutil
 import logging
@@ -24,18 +25,18 @@ sys.path.insert(0, str(project_root))
 
 logger = logging.getLogger("tools.run_alignment")
 
-def main() -> None:
-    with open(config_yaml_path, "r") as f:
-        raw_config = yaml.safe_load(f)
+# Top-level "USE_MANUAL_ALIGNMENT: <value>" line; group 2 is the YAML scalar
+MANUAL_ALIGNMENT_RE = re.compile(r'^(USE_MANUAL_ALIGNMENT[ \t]*:[ \t]*)([^\s#]+)', re.M)
 
-    original_value = raw_config.get("USE_MANUAL_ALIGNMENT", False)
+def main() -> None:
+    config_text = config_yaml_path.read_text()
+    match = MANUAL_ALIGNMENT_RE.search(config_text)
+    original_value = bool(match) and yaml.safe_load(match.group(2)) is True
 
     try:
         if original_value:
             logger.info("USE_MANUAL_ALIGNMENT is True — temporarily setting to False in config.yaml.")
-            raw_config["USE_MANUAL_ALIGNMENT"] = False
-            with open(config_yaml_path, "w") as f:
-                yaml.dump(raw_config, f, default_flow_style=False, sort_keys=False)
+            config_yaml_path.write_text(MANUAL_ALIGNMENT_RE.sub(r"\g<1>false", config_text, count=1))
 
         from PRISM import config
         from PRISM import psipred_client
@@ -65,9 +66,7 @@ def main() -> None:
     finally:
         if original_value:
             logger.info("Restoring USE_MANUAL_ALIGNMENT to True in config.yaml.")
-            raw_config["USE_MANUAL_ALIGNMENT"] = True
-            with open(config_yaml_path, "w") as f:
-                yaml.dump(raw_config, f, default_flow_style=False, sort_keys=False)
+            config_yaml_path.write_text(config_text)
 
 def bullet_proof_ali(ali_file: Path) -> None:
     """
@@ -13,94 +13,248 @@ Preserves BLK residues and chain breaks (/) in their original alignment position
 import sys
 import argparse
 import os
-import re
-from typing import List, Dict, Any, Tuple, Set
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple, Set, Iterator, Union, Optional
+
+import numpy as np
+from numba import njit
 
 from modeller import *
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from pdb_utils import PDBAtom
+# Byte -> is-residue lookup table for PIR alignment rows (one-letter codes 'A'..'Z')
+AA_LUT = np.zeros(256, dtype=bool)
+AA_LUT[ord('A'):ord('Z') + 1] = True
+
+ATOM_RECORDS = (b'ATOM', b'HETATM')
+RECORD_FIRST_BYTES = frozenset(b'AH')
+TER_LINE = b"TER\n"
+END_LINE = b"END\n"
+WRITE_BUFFER_SIZE = 1 << 20
+PDB_LINE_WIDTH = 80
+# Fixed-column ATOM/HETATM layout written by renumber_pdb (same output as PDBAtom.to_pdb_line)
+PDB_RECORD_FORMAT = b"%-6s%5d %4s%s%3s %s%4d%s   %8.3f%8.3f%8.3f%6.2f%6.2f          %2s\n"
+
+# PIR line classes: entry type lines and the other non-sequence lines of an entry
+ALI_ENTRY_TYPES = (b'structure', b'sequence')
+ALI_HEADER_PREFIXES = ALI_ENTRY_TYPES + (b'C;', b' ')
+# Bytes deleted from sequence lines (the ASCII whitespace set matched by \s)
+SEQ_WHITESPACE = b' \t\n\r\x0b\x0c'
+
+def iter_pdb_atom_lines(pdb_path: str) -> Iterator[bytes]:
+    '''
+    Yields the raw ATOM/HETATM records of a PDB file as bytes.
+    The file is memory-mapped and scanned by newline offsets; other records are never copied.
+    '''
+    if os.path.getsize(pdb_path) == 0:
+        return
+    with open(pdb_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        find = mm.find
+        start = 0
+        while start < size:
+            end = find(b'\n', start)
+            if end == -1:
+                end = size
+            # One-byte peek first: only 'A'/'H' lines are sliced out and prefix-checked
+            if mm[start] in RECORD_FIRST_BYTES:
+                line = mm[start:end]
+                if line.startswith(ATOM_RECORDS):
+                    yield line
+            start = end + 1
+
+def _column(records: np.ndarray, start: int, end: int) -> np.ndarray:
+    '''
+    Returns PDB columns [start, end) of every record as a fixed-width bytes array.
+    '''
+    return np.ascontiguousarray(records[:, start:end]).view(f'S{end - start}').ravel()
+
+def _int_column(col: np.ndarray) -> np.ndarray:
+    '''
+    Parses an integer column; unparsable entries become 0, as in PDBAtom.
+    '''
+    try:
+        return col.astype(np.int64)
+    except ValueError:
+        out = np.zeros(len(col), dtype=np.int64)
+        for k, v in enumerate(col.tolist()):
+            try:
+                out[k] = int(v)
+            except ValueError:
+                pass
+        return out
+
+def _float_column(col: np.ndarray, default: float) -> np.ndarray:
+    '''
+    Parses an optional float column; blank entries take the default, as in PDBAtom.
+    '''
+    out = np.full(len(col), default)
+    filled = np.char.strip(col) != b''
+    out[filled] = col[filled].astype(np.float64)
+    return out
+
+def read_pdb_columns(pdb_path: str) -> Dict[str, np.ndarray]:
+    '''
+    Reads the ATOM/HETATM records of a PDB file into one NumPy array per field (columnar layout),
+    parsed in bulk instead of one PDBAtom object per record. Records are padded to 80 columns,
+    so short lines yield the same blank/default fields PDBAtom would.
+    '''
+    lines = [line.rstrip(b'\r')[:PDB_LINE_WIDTH].ljust(PDB_LINE_WIDTH) for line in iter_pdb_atom_lines(pdb_path)]
+    records = np.frombuffer(b''.join(lines), dtype=np.uint8).reshape(len(lines), PDB_LINE_WIDTH)
+    return {
+        'record_type': _column(records, 0, 6),
+        'name': _column(records, 12, 16),
+        'alt_loc': _column(records, 16, 17),
+        'res_name': np.char.strip(_column(records, 17, 20)),
+        'chain_id': _column(records, 21, 22),
+        'res_seq': _int_column(_column(records, 22, 26)),
+        'i_code': _column(records, 26, 27),
+        'x': _column(records, 30, 38).astype(np.float64),
+        'y': _column(records, 38, 46).astype(np.float64),
+        'z': _column(records, 46, 54).astype(np.float64),
+        'occ': _float_column(_column(records, 54, 60), 1.00),
+        'temp': _float_column(_column(records, 60, 66), 0.00),
+        'element': np.char.strip(_column(records, 76, 78)),
+    }
+
+@njit(cache=True)
+def _renumber_records(chain_id, res_seq, i_code, is_blk, keep):
+    '''
+    Selects and renumbers records in one pass per block, on integer codes only.
+    Protein records are kept where the keep mask is set, and renumbered from 1 on every chain; BLK/HETATM records follow and continue the numbering.
+    Returns the output record order, the new resSeq of each output record, a TER-before flag
+    per output record and the number of protein records.
+    '''
+    n = chain_id.size
+    order = np.empty(n, np.int64)
+    new_res_seq = np.empty(n, np.int64)
+    ter_before = np.zeros(n, np.bool_)
+    k = 0
+    seq = 0
+    prev = 0
+
+    # 1. Protein
+    for a in range(n):
+        if is_blk[a] or not keep[a]:
+            continue
+        if k > 0:
+            prev = order[k - 1]
+            if chain_id[a] != chain_id[prev]:
+                ter_before[k] = True
+                seq = 1
+            elif res_seq[a] != res_seq[prev] or i_code[a] != i_code[prev]:
+                seq += 1
+        else:
+            seq = 1
+        order[k] = a
+        new_res_seq[k] = seq
+        k += 1
+    n_prot = k
+
+    # 2. BLK
+    for a in range(n):
+        if not is_blk[a]:
+            continue
+        if k > 0:
+            prev = order[k - 1]
+            ter_before[k] = chain_id[a] != chain_id[prev]
+            if k == n_prot or ter_before[k] or res_seq[a] != res_seq[prev] or i_code[a] != i_code[prev]:
+                seq += 1
+        else:
+            seq += 1
+        order[k] = a
+        new_res_seq[k] = seq
+        k += 1
+
+    return order[:k], new_res_seq[:k], ter_before[:k], n_prot
+
+def _write_pdb_records(buf: bytearray, cols: Dict[str, np.ndarray], order: np.ndarray, serial: np.ndarray, res_seq: np.ndarray):
+    '''
+    Formats the selected records with the precompiled fixed-column PDB_RECORD_FORMAT straight
+    into buf, matching PDBAtom.to_pdb_line byte for byte.
+    '''
+    rows = zip(
+        cols['record_type'][order].tolist(), serial.tolist(), cols['name'][order].tolist(),
+        cols['alt_loc'][order].tolist(), cols['res_name'][order].tolist(), cols['chain_id'][order].tolist(),
+        res_seq.tolist(), cols['i_code'][order].tolist(), cols['x'][order].tolist(), cols['y'][order].tolist(),
+        cols['z'][order].tolist(), cols['occ'][order].tolist(), cols['temp'][order].tolist(),
+        cols['element'][order].tolist(),
+    )
+    for row in rows:
+        buf += PDB_RECORD_FORMAT % row
 
-def renumber_pdb(pdb_path: str, residues_to_keep: Set[int], output_path: str):
+def _write_chain_blocks(buf: bytearray, cols: Dict[str, np.ndarray], order: np.ndarray, serial: np.ndarray,
+                        res_seq: np.ndarray, chain_breaks: np.ndarray):
+    '''
+    Writes one block of records to buf with a TER record before every chain break and after the last one.
+    '''
+    prev = 0
+    for b in np.flatnonzero(chain_breaks).tolist() + [len(order)]:
+        _write_pdb_records(buf, cols, order[prev:b], serial[prev:b], res_seq[prev:b])
+        buf += TER_LINE
+        prev = b
+
+def prepare_ali_row(seq_bytes: Union[bytes, bytearray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Returns the arrays describing one alignment row: its bytes, the amino-acid column mask and
+    the residue -> column map (1-based protein residue number at every amino-acid column).
     '''
-    Reads PDB, keeps only protein residues in residues_to_keep SET + all BLK/HETATM,
+    seq = np.frombuffer(seq_bytes, dtype=np.uint8)
+    aa_mask = AA_LUT[seq]
+    return seq, aa_mask, np.cumsum(aa_mask, dtype=np.int32)
+
+def renumber_pdb(pdb_path: str, residues_to_keep: Optional[Union[Set[int], np.ndarray]], output_path: str,
+                 keep_limit: Optional[int] = None):
+    '''
+    Reads PDB, keeps only protein residues in residues_to_keep (set or integer array; None keeps
+    the first keep_limit protein residues, or all of them without a limit) + all BLK/HETATM,
     and renumbers BOTH protein and BLK/HETATM residues.
     Protein chains reset to 1. BLK/HETATM chains continue numbering from last residue.
     '''
-    protein_atoms = []
-    blk_atoms = []
-    
-    with open(pdb_path, 'r') as f:
-        prot_res_count = 0
-        last_prot_res_id = None
-        for line in f:
-            if line.startswith(('ATOM', 'HETATM')):
-                atom = PDBAtom(line)
-                res_id = (atom.chain_id, atom.res_seq, atom.i_code)
-                
-                if atom.record_type == 'HETATM' or atom.res_name == 'BLK':
-                    blk_atoms.append(atom)
-                else:
-                    if res_id != last_prot_res_id:
-                        prot_res_count += 1
-                        last_prot_res_id = res_id
-                    
-                    if prot_res_count in residues_to_keep:
-                        protein_atoms.append(atom)
-    
-    new_lines = []
-    serial = 1
-    new_res_seq = 0
-    
-    # 1. Renumber Protein
-    last_old_res_id = None
-    last_chain_id = None
-    for atom in protein_atoms:
-        if last_chain_id is not None and atom.chain_id != last_chain_id:
-            new_lines.append("TER")
-            new_res_seq = 0
-            last_old_res_id = None
-        
-        old_res_id = (atom.chain_id, atom.res_seq, atom.i_code)
-        if old_res_id != last_old_res_id:
-            new_res_seq += 1
-            last_old_res_id = old_res_id
-        
-        atom.serial = serial
-        atom.res_seq = new_res_seq
-        new_lines.append(atom.to_pdb_line())
-        serial += 1
-        last_chain_id = atom.chain_id
-    
-    if protein_atoms:
-        new_lines.append("TER")
+    cols = read_pdb_columns(pdb_path)
+    chain_id = cols['chain_id'].view(np.uint8)
+    res_seq = cols['res_seq']
+    i_code = cols['i_code'].view(np.uint8)
+    is_blk = (cols['record_type'] == b'HETATM') | (cols['res_name'] == b'BLK')
+
+    # Running protein residue count (1-based) of every protein record: a new residue starts
+    # at the first record and wherever chain, resSeq or iCode change between protein records
+    prot = np.flatnonzero(~is_blk)
+    new_res = np.ones(len(prot), dtype=bool)
+    new_res[1:] = (np.diff(chain_id[prot]) != 0) | (np.diff(res_seq[prot]) != 0) | (np.diff(i_code[prot]) != 0)
+    prot_res_count = np.cumsum(new_res)
+
+    if residues_to_keep is None:
+        # Keep-all fast path: no membership test, and no mask at all when the limit
+        # does not cut into the protein residues
+        if keep_limit is None or not len(prot) or prot_res_count[-1] <= keep_limit:
+            keep = ~is_blk
+        else:
+            keep = np.zeros(len(is_blk), dtype=bool)
+            keep[prot] = prot_res_count <= keep_limit
+    else:
+        if isinstance(residues_to_keep, np.ndarray):
+            keep_ids = residues_to_keep
+        else:
+            keep_ids = np.fromiter(residues_to_keep, dtype=np.int64, count=len(residues_to_keep))
+        # One vectorized membership test for all protein records instead of a set lookup per atom
+        keep = np.zeros(len(is_blk), dtype=bool)
+        keep[prot] = np.isin(prot_res_count, keep_ids)
+
+    order, new_res_seq, ter_before, n_prot = _renumber_records(chain_id, res_seq, i_code, is_blk, keep)
+    serial = np.arange(1, len(order) + 1)
     
-    # 2. Renumber BLK
-    last_old_res_id = None
-    for atom in blk_atoms:
-        if last_chain_id is not None and atom.chain_id != last_chain_id:
-            new_lines.append("TER")
-            last_old_res_id = None
-            
-        old_res_id = (atom.chain_id, atom.res_seq, atom.i_code)
-        if old_res_id != last_old_res_id:
-            new_res_seq += 1
-            last_old_res_id = old_res_id
-        
-        atom.serial = serial
-        atom.res_seq = new_res_seq
-        new_lines.append(atom.to_pdb_line())
-        serial += 1
-        last_chain_id = atom.chain_id
-        
-    if blk_atoms:
-        new_lines.append("TER")
+    # Records are formatted straight into one growing buffer and written with a single call
+    buf = bytearray()
+    # 1. Protein block, 2. BLK block: TER at every chain break and after each non-empty block
+    for lo, hi in ((0, n_prot), (n_prot, len(order))):
+        if hi > lo:
+            _write_chain_blocks(buf, cols, order[lo:hi], serial[lo:hi], new_res_seq[lo:hi], ter_before[lo:hi])
     
-    new_lines.append("END")
+    buf += END_LINE
     
-    with open(output_path, 'w') as f:
-        for l in new_lines:
-            f.write(l + "\n")
+    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(buf)
 
 def unify_templates(align_file: str, overlap_limit: int):
     env = Environ()
@@ -111,140 +265,137 @@ def unify_templates(align_file: str, overlap_limit: int):
         print("Less than 2 templates found. Nothing to unify.")
         return
 
-    def is_aa(c):
-        return 'A' <= c <= 'Z'
-
     tmp_ali = "_tmp_unify.ali"
     aln.write(file=tmp_ali)
+    # Sequence lines are appended in place to one bytearray per code (no repeated str +=)
+    # and the rows stay as bytes for the NumPy selection below
     ali_strings = {}
-    with open(tmp_ali, 'r') as f:
-        curr_code = None
+    with open(tmp_ali, 'rb') as f:
+        curr_seq = None
         for line in f:
-            if line.startswith('>P1;'):
-                curr_code = line[4:].strip()
-                ali_strings[curr_code] = ""
-            elif curr_code and not line.startswith(('structure', 'sequence', 'C;', ' ')):
-                cleaned = re.sub(r'\s+', '', line).rstrip('*')
-                ali_strings[curr_code] += cleaned
+            if line.startswith(b'>P1;'):
+                curr_seq = ali_strings[line[4:].strip().decode()] = bytearray()
+            elif curr_seq is not None and not line.startswith(ALI_HEADER_PREFIXES):
+                curr_seq += line.translate(None, SEQ_WHITESPACE).rstrip(b'*')
     if os.path.exists(tmp_ali):
         os.remove(tmp_ali)
 
-    covered_positions = set()
-    new_sequences = {} 
+    # Per-template row arrays are derived once up front and reused by the selection loop
+    ali_rows = {temp.code: prepare_ali_row(ali_strings[temp.code]) for temp in templates if ali_strings.get(temp.code)}
 
-    for i, temp in enumerate(templates):
-        print(f"Processing template {i+1}: {temp.code}")
+    # One byte per alignment column, set once a higher-priority template claims it
+    covered_mask = np.zeros(max(map(len, ali_strings.values()), default=0), dtype=bool)
+    new_sequences = {} 
+    # PDB rewrites only depend on each template's own selection: they are handed to a process
+    # pool as soon as the selection is made, while the sequential covered-column pass goes on
+    renumber_jobs = []
+    with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(templates))) as pool:
+        for i, temp in enumerate(templates):
+            # Modeller attributes are read once per template; every later use goes through locals
+            code = temp.code
+            atom_file = temp.atom_file
+            n_residues = len(temp.residues)
+            print(f"Processing template {i+1}: {code}")
         
-        temp_seq_str = ali_strings.get(temp.code, "")
-        if not temp_seq_str:
-            print(f"  Warning: Sequence for {temp.code} not found in alignment.")
-            continue
+            if code not in ali_rows:
+                print(f"  Warning: Sequence for {code} not found in alignment.")
+                continue
 
-        temp_aa_positions = [j for j in range(len(temp_seq_str)) if is_aa(temp_seq_str[j])]
-        overlapping_aa_pos = [pos for pos in temp_aa_positions if pos in covered_positions]
-        
-        residues_to_keep = set()
+            seq, aa_mask, res_idx = ali_rows[code]
+            n_cols = len(seq)
+            covered = covered_mask[:n_cols]
+            n_overlapping = int(np.count_nonzero(aa_mask & covered))
         
-        if not overlapping_aa_pos or len(overlapping_aa_pos) <= overlap_limit:
-            residues_to_keep = set(range(1, len(temp.residues) + 1))
-            print(f"  No excessive overlap. Keeping all {len(residues_to_keep)} protein residues.")
-        else:
-            non_overlapping_pos = set(pos for pos in temp_aa_positions if pos not in covered_positions)
-            
-            if not non_overlapping_pos:
-                print(f"  WARNING: Completely covered! Keeping only buffer.")
-                keep_aa_pos = set(temp_aa_positions[:overlap_limit])
+            if not n_overlapping or n_overlapping <= overlap_limit:
+                # Keep residues 1..n_residues: the renumber_pdb keep-all path capped at n_residues,
+                # which trims the PDB where the structure header ends the segment early
+                residues_to_keep = None
+                keep_limit = n_residues
+                keep_aa_mask = aa_mask & (res_idx <= n_residues)
+                print(f"  No excessive overlap. Keeping all {n_residues} protein residues.")
             else:
-                expanded_nop = set()
-                for nop in non_overlapping_pos:
-                    for offset in range(-overlap_limit, overlap_limit + 1):
-                        expanded_nop.add(nop + offset)
-                
-                keep_aa_pos = expanded_nop.intersection(set(temp_aa_positions))
-
-            res_idx = 0
-            for j in range(len(temp_seq_str)):
-                if is_aa(temp_seq_str[j]):
-                    res_idx += 1
-                    if j in keep_aa_pos:
-                        residues_to_keep.add(res_idx)
+                non_overlapping = aa_mask & ~covered
             
-            print(f"  Overlap resolved. Keeping {len(residues_to_keep)} protein residues.")
-
-        # Update covered positions and create new alignment sequence string
-        res_idx = 0
-        new_seq_list = []
-        for j in range(len(temp_seq_str)):
-            char = temp_seq_str[j]
-            if is_aa(char):
-                res_idx += 1
-                if res_idx in residues_to_keep:
-                    covered_positions.add(j)
-                    new_seq_list.append(char)
+                if not non_overlapping.any():
+                    print(f"  WARNING: Completely covered! Keeping only buffer.")
+                    keep_aa_mask = aa_mask & (res_idx <= overlap_limit)
+                elif overlap_limit < 0:
+                    # An empty neighbourhood expands to nothing
+                    keep_aa_mask = np.zeros_like(aa_mask)
                 else:
-                    new_seq_list.append('-')
-            else:
-                new_seq_list.append(char)
+                    # 1-D binary dilation of the non-overlapping columns by +-overlap_limit: window sums
+                    # taken as two shifted slices of an edge-padded prefix count
+                    nop_count = np.pad(np.concatenate(([0], np.cumsum(non_overlapping, dtype=np.int32))), overlap_limit, mode='edge')
+                    width = 2 * overlap_limit + 1
+                    keep_aa_mask = aa_mask & (nop_count[width:width + n_cols] > nop_count[:n_cols])
+
+                # Already sorted and unique: res_idx strictly increases over amino-acid columns
+                residues_to_keep = res_idx[keep_aa_mask]
+                keep_limit = None
+                print(f"  Overlap resolved. Keeping {len(residues_to_keep)} protein residues.")
+
+            # Update covered positions and create new alignment sequence string
+            covered |= keep_aa_mask
+            new_seq = seq.copy()
+            new_seq[aa_mask & ~keep_aa_mask] = ord('-')
         
-        last_aa_pos = -1
-        for j in range(len(new_seq_list)-1, -1, -1):
-            if is_aa(new_seq_list[j]):
-                last_aa_pos = j
-                break
+            # Residues left in the new row are exactly the kept ones
+            kept_cols = np.flatnonzero(keep_aa_mask)
+            last_aa_pos = int(kept_cols[-1]) if len(kept_cols) else -1
         
-        tail_start = last_aa_pos + 1
-        tail_chars = new_seq_list[tail_start:]
-        if tail_chars:
-            num_dots = tail_chars.count('.')
-            has_slash = '/' in tail_chars
-            num_gaps = len(tail_chars) - num_dots - (1 if has_slash else 0)
-            
-            new_tail = (['-'] * num_gaps)
-            if has_slash:
-                new_tail.append('/')
-            new_tail.extend(['.'] * num_dots)
-            new_seq_list[tail_start:] = new_tail
+            # Normalize the tail after the last residue to gaps, one '/' (if any), then the BLK dots
+            tail = new_seq[last_aa_pos + 1:]
+            if tail.size:
+                num_dots = int(np.count_nonzero(tail == ord('.')))
+                has_slash = bool(np.any(tail == ord('/')))
+                num_gaps = tail.size - num_dots - has_slash
+                tail[:] = np.frombuffer(b'-' * num_gaps + (b'/' if has_slash else b'') + b'.' * num_dots, dtype=np.uint8)
             
-        new_sequences[temp.code] = "".join(new_seq_list)
+            new_sequences[code] = new_seq.tobytes().decode('ascii')
 
-        orig_pdb = temp.atom_file.strip() if temp.atom_file else ""
-        if not orig_pdb or not os.path.exists(orig_pdb):
-            orig_pdb = f"{temp.code.strip()}.pdb"
+            orig_pdb = atom_file.strip() if atom_file else ""
+            if not orig_pdb or not os.path.exists(orig_pdb):
+                orig_pdb = f"{code.strip()}.pdb"
             
-        if os.path.exists(orig_pdb):
-            output_pdb = f"{temp.code.split('.')[0]}_unified.pdb"
+            if os.path.exists(orig_pdb):
+                output_pdb = f"{code.split('.')[0]}_unified.pdb"
             
-            renumber_pdb(orig_pdb, residues_to_keep, output_pdb)
+                renumber_jobs.append((output_pdb, pool.submit(renumber_pdb, orig_pdb, residues_to_keep, output_pdb, keep_limit)))
+                temp.atom_file = output_pdb
+            else:
+                print(f"  Error: {orig_pdb} not found. Cannot modify structure.")
+
+        for output_pdb, job in renumber_jobs:
+            job.result()
             print(f"  Generated {output_pdb}")
-            temp.atom_file = output_pdb
-        else:
-            print(f"  Error: {orig_pdb} not found. Cannot modify structure.")
 
     output_ali = align_file.replace('.ali', '_unified.ali')
-    with open(align_file, 'r') as f_in, open(output_ali, 'w') as f_out:
-        current_code = None
-        seq_buffer = ""
+    # Single pass over the original alignment: an entry whose sequence was rewritten stays in
+    # rewrite mode until its terminating '*' line; everything else is copied through.
+    out = []
+    rewriting = False
+    with open(align_file, 'rb') as f_in:
         for line in f_in:
-            if line.startswith('>P1;'):
-                current_code = line[4:].strip()
+            if line.startswith(b'>P1;'):
+                current_code = line[4:].strip().decode()
+                unified_name = f"{os.path.splitext(current_code)[0]}_unified.pdb"
+                rewriting = current_code in new_sequences
                 if current_code.endswith('.pdb'):
-                    base_name = os.path.splitext(current_code)[0]
-                    unified_name = f"{base_name}_unified.pdb"
-                    f_out.write(f">P1;{unified_name}\n")
-                else:
-                    f_out.write(line)
-            elif current_code in new_sequences and not line.startswith(('structure', 'sequence', 'C;', ' ')):
-                if '*' in line:
-                    f_out.write(new_sequences[current_code] + "*\n")
-                    current_code = None
+                    out.append(f">P1;{unified_name}\n".encode())
                 else:
-                    pass
-            elif current_code in new_sequences and line.startswith(('structure', 'sequence')):
-                base_name = os.path.splitext(current_code)[0]
-                unified_name = f"{base_name}_unified.pdb"
-                f_out.write(line.replace(current_code, unified_name))
-            else:
-                f_out.write(line)
+                    out.append(line)
+            elif not rewriting:
+                out.append(line)
+            elif line.startswith(ALI_ENTRY_TYPES):
+                out.append(line.replace(current_code.encode(), unified_name.encode()))
+            elif line.startswith(ALI_HEADER_PREFIXES):
+                out.append(line)
+            elif b'*' in line:
+                out.append(new_sequences[current_code].encode('ascii') + b"*\n")
+                rewriting = False
+
+    with open(output_ali, 'wb') as f_out:
+        f_out.write(b"".join(out))
 
     print(f"\nSuccess! Unified alignment written to {output_ali}")
 def main():